@@ -0,0 +1,147 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from utils.dates import parse_date, is_open
+from utils.driver_pool import lease_driver
+from utils.orchestrator import abandoned
+from utils.download_cache import get_download_cache, FAILED
+from utils.readiness import wait_for_document_ready, wait_for_selector
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+# Where each output kind of a source spec is downloaded to
+OUTPUT_DIRECTORIES = {
+    "pdf": "database/pdfs",
+}
+ICON_DIRECTORY = "database/agency_icons"
+WINDOW_SIZE = (1000, 755)
+# Files of one source downloaded at the same time
+DOWNLOAD_WORKERS = 4
+
+
+class Bot:
+    """
+    Runs one declarative source spec, see bots/sources.py.
+
+    The browser, leased from the shared pool, is only used to find the file links: it
+    loads the start URL, clicks through the navigation steps and reads the links, then goes
+    back to the pool. The files and the site icon are then fetched in parallel through the
+    download cache, so unchanged files cost a 304.
+
+    A spec is a dict with:
+        name (str): Shown in the logs.
+        url (str): Start URL.
+        steps (list): (By, selector) pairs clicked in order to reach the vacancies page.
+        container (tuple): (By, selector) of the element holding the vacancies, waited for.
+        links (tuple): (By, selector) of the file links, relative to `container`, or to
+            each row when there is a date filter.
+        date_filter (dict): Optional. "rows" (By, selector) relative to `container`,
+            "date" (By, selector) of the closing date cells within a row and "window" (days),
+            only rows closing within that many days from today are kept.
+        output (str): Kind of file the links point to, a key of OUTPUT_DIRECTORIES.
+    """
+
+    def __init__(self, spec: dict):
+        if spec.get("output", "pdf") not in OUTPUT_DIRECTORIES:
+            raise ValueError(f"{spec['name']}: unknown output kind '{spec['output']}'")
+        self.spec = spec
+        self.name = spec["name"]
+        self.url = spec["url"]
+        self.download_directory = OUTPUT_DIRECTORIES[spec.get("output", "pdf")]
+        self.driver = None
+
+    def run(self):
+        logging.info(f'{self.name} Bot running')
+        logging.info(f"{self.name} loading URL: {self.url}")
+        # Lease a warm headless Firefox from the shared pool, only while the page is needed
+        self.driver = lease_driver(window_size=WINDOW_SIZE)
+        try:
+            self.driver.get(self.url)
+            wait_for_document_ready(self.driver)
+            icon_url = self.get_icon_url()
+            self.navigation()
+            file_urls = self.get_file_urls()
+        finally:
+            self.driver.quit()
+
+        if abandoned():
+            logging.warning(f"{self.name} timed out, not downloading its files")
+            return
+        downloads = [(url, os.path.join(self.download_directory, file_name(url))) for url in file_urls]
+        if icon_url:
+            downloads.append((icon_url, os.path.join(ICON_DIRECTORY, icon_url.split('/')[-1])))
+        failed = self.download(downloads)
+        logging.info(f'{self.name} task completed, {len(file_urls)} files, {failed} failed.')
+
+    def navigation(self):
+        for by, selector in self.spec.get("steps", []):
+            try:
+                wait_for_selector(self.driver, selector, by=by, visible=True).click()
+            except Exception as e:
+                logging.error(f"{self.name} error clicking element: {e}")
+        logging.info(f"{self.name} loading career page")
+
+    def get_file_urls(self) -> list:
+        """The URLs of the files to download, without repeats, in page order."""
+        by, selector = self.spec["container"]
+        try:
+            container = wait_for_selector(self.driver, selector, by=by)
+        except Exception as e:
+            logging.error(f'{self.name} table not found: {e}')
+            return []
+        self.driver.execute_script("arguments[0].scrollIntoView();", container)
+
+        date_filter = self.spec.get("date_filter")
+        if date_filter:
+            rows = container.find_elements(*date_filter["rows"])
+            scopes = [row for row in rows if self.still_open(row, date_filter)]
+        else:
+            scopes = [container]
+
+        urls = []
+        for scope in scopes:
+            for link in scope.find_elements(*self.spec["links"]):
+                url = link.get_attribute('href')
+                if url and url not in urls:
+                    urls.append(url)
+        return urls
+
+    def still_open(self, row, date_filter: dict) -> bool:
+        """Whether the closing date in `row` is within the filter's window from today."""
+        window = timedelta(days=date_filter["window"]) if date_filter.get("window") else None
+        for cell in row.find_elements(*date_filter["date"]):
+            closing_date = parse_date(cell.text.strip(), source=self.name)
+            if closing_date:
+                return is_open(closing_date, window=window)
+        return False
+
+    def get_icon_url(self):
+        try:
+            link_element = self.driver.find_element(By.CSS_SELECTOR, "link[rel='icon']")
+            return link_element.get_attribute('href') or None
+        except NoSuchElementException:
+            logging.info(f"{self.name} icon URL not found.")
+            return None
+
+    def download(self, downloads: list) -> int:
+        """Fetches (url, path) pairs in parallel through the download cache, returns the number that failed."""
+        for directory in {os.path.dirname(path) for _, path in downloads}:
+            os.makedirs(directory, exist_ok=True)
+        cache = get_download_cache()
+        source_thread = threading.current_thread()
+
+        def fetch(download):
+            # Files not started when the source timed out are skipped
+            return FAILED if abandoned(source_thread) else cache.fetch(*download)
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            results = list(executor.map(fetch, downloads))
+        return results.count(FAILED)
+
+
+def file_name(url: str) -> str:
+    """The bots' name for a downloaded file, the last part of its URL with %20 as '_'."""
+    return url.split('/')[-1].replace('%20', '_')
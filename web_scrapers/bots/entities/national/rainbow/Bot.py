@@ -1,14 +1,15 @@
 import os
-import time
 import logging
-from selenium import webdriver
+from utils.driver_pool import lease_driver
+from utils.download_cache import get_download_cache
+from utils.readiness import wait_for_document_ready, wait_for_download, wait_for_network_idle
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 # from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, ElementNotInteractableException
 # from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
+# from selenium.webdriver.firefox.options import Options as FirefoxOptions
 # from webdriver_manager.firefox import GeckoDriverManager
 
 
@@ -19,43 +20,19 @@ class Bot:
         self.driver = None
         self.wait = None
         # Specify the directory to save the downloaded files
-        self.download_directory = 'C:\\Users\\pimp\\Desktop\\projects\\job_board\\backend\\database\\pdfs'
+        # Firefox needs an absolute path for its download directory
+        self.download_directory = os.path.abspath('database/pdfs')
 
     def setup_driver(self):
-        # Set up Firefox options
-        opt = webdriver.FirefoxOptions()
-        # opt.add_argument("--headless")  # Run in headless mode if needed
-
-        # Set up Firefox profile for handling PDF downloads
-        profile = webdriver.FirefoxProfile()
-
-        # Configure download settings
-        # Use a custom download directory
-        profile.set_preference("browser.download.folderList", 2)
-        # Don't show download manager
-        profile.set_preference(
-            "browser.download.manager.showWhenStarting", False)
-        # Set the download directory
-        profile.set_preference("browser.download.dir", self.download_directory)
-        # Download PDFs automatically
-        profile.set_preference(
-            "browser.helperApps.neverAsk.saveToDisk", "application/pdf")
-
-        # Attach the profile to the options
-        opt.profile = profile
-
-        # Initialize the WebDriver with the updated options
-        self.driver = webdriver.Firefox(options=opt)
-
-        # Set the window size to 1000x755
-        self.driver.set_window_size(1000, 755)
+        # Pooled browsers already save PDFs to database/pdfs without asking
+        self.driver = lease_driver(window_size=(1000, 755))
 
     def run(self):
 
         self.setup_driver()
         self.wait = WebDriverWait(self.driver, 10)
         self.driver.get(self.url)
-        self.pause(10)
+        wait_for_document_ready(self.driver)
         self.get_icon_url()
 
         logging.info(f'{self.name} Bot running')
@@ -79,7 +56,7 @@ class Bot:
 
     def get_vacancies_view_links(self):
         try:
-            self.pause(10)
+            wait_for_network_idle(self.driver)
             # Find table and scroll it into view
             table = self.wait.until(EC.presence_of_element_located(
                 (By.CSS_SELECTOR, 'table#ContentPlaceHolder1_grvvacancies')))
@@ -104,7 +81,7 @@ class Bot:
     def view_vacancies(self):
         try:
             # Scroll postions vacancey link into view, find the element using XPath
-            self.pause(10)
+            wait_for_document_ready(self.driver)
             vacancy_button = self.wait.until(EC.presence_of_element_located(
                 (By.XPATH, "//a[text()='VIEW ALL OUR CURRENT VACANCIES HERE']")))
             # Scroll the element into view &  Use JavaScript to click
@@ -150,17 +127,14 @@ class Bot:
                 if window != original_window:
                     self.driver.switch_to.window(window)
                     break
-            self.pause(10)  # Consider using an explicit wait instead of a fixed pause
-
-            # Get a list of files in the download directory after downloading
-            after_download = set(os.listdir(self.download_directory))
-            new_files = after_download - before_download
+            # Wait for the new file to finish downloading
+            new_files = wait_for_download(self.download_directory, before_download)
 
             if new_files:
                 file_name = new_files.pop()
                 logging.info(f"Downloaded file: {file_name}")
             else:
-                logging.info(f"File '{file_name}' already downloaded previously.")
+                logging.info(f"{self.name} no new file downloaded, it was probably downloaded previously.")
 
             # Close the new tab if opened and switch back to the original window
             if len(all_windows) > 1:
@@ -194,11 +168,6 @@ class Bot:
 
         return self.driver.execute_script(script)
 
-    def pause(self, seconds):
-
-        logging.info(f"Pausing for {seconds} seconds...")
-        time.sleep(seconds)
-
     def wait_for_exit(self):
 
         logging.info(
@@ -212,13 +181,6 @@ class Bot:
                 "Invalid input. Type 'exit' and press Enter to proceed...")
             self.wait_for_exit()
 
-    def file_exists(self, file_path, file_name):
-        
-        if os.path.exists(file_path):
-            logging.info(f"File '{file_name}' already downloaded previously.")
-            return True
-        return False
-
     def get_icon_url(self):
         try:
             link_element = self.wait.until(EC.presence_of_element_located(
@@ -231,3 +193,11 @@ class Bot:
                 logging.info("Icon URL not found or is empty.")
         except Exception as e:
             logging.error(f"Error finding the icon URL")
+
+    def download_file(self, file_url):
+        # Extract the file name from the URL
+        file_name = file_url.split('/')[-1]
+        file_path = os.path.join("database/agency_icons", file_name)
+
+        # Conditional GET, an unchanged icon is not downloaded again
+        get_download_cache().fetch(file_url, file_path)
@@ -0,0 +1,46 @@
+from selenium.webdriver.common.by import By
+
+# Agencies whose vacancies are PDF links on their careers page, run by bots/engine.py.
+# Adding an agency that works the same way only needs an entry here.
+SOURCES = {
+    "NCR": {
+        "name": "National Credit Regulator",
+        "url": "https://www.ncr.org.za/",
+        "steps": [
+            # Careers menu item
+            (By.CSS_SELECTOR, "#bm-cool-menu-108 > ul > li.item-104 > a"),
+        ],
+        "container": (By.XPATH, '//*[@id="sp-component"]/article/section/table/tbody'),
+        # "Download" column
+        "links": (By.XPATH, './/td[3]/a'),
+        "output": "pdf",
+    },
+    "CSOS": {
+        "name": "Community Schemes Ombud Service",
+        "url": "https://csos.org.za/",
+        "steps": [
+            # Side bar menu, then its careers item
+            (By.XPATH, "/html/body/div[1]/section[2]/div/div[3]/div/div/div/div"),
+            (By.XPATH, '//*[@id="menu-2-a4c9d1b"]/li[7]/a'),
+        ],
+        "container": (By.XPATH, '//*[@id="content"]/div/div[1]/section[2]/div/div/div/div[2]'),
+        "links": (By.XPATH, '//a[.//span[text()="Apply"]]'),
+        "output": "pdf",
+    },
+    "Postbank": {
+        "name": "Postbank",
+        "url": "https://www.postbank.co.za/",
+        "steps": [
+            (By.XPATH, '//*[@id="menuwrapper"]/nav/ul/li[8]/a'),
+        ],
+        "container": (By.XPATH, '/html/body/div[5]/div/div/div/table'),
+        "links": (By.XPATH, './/a[@class="myLink"]'),
+        # Only vacancies closing within two weeks, older rows stay in the table long after closing
+        "date_filter": {
+            "rows": (By.XPATH, './/tbody/tr'),
+            "date": (By.XPATH, './/td/p'),
+            "window": 14,
+        },
+        "output": "pdf",
+    },
+}
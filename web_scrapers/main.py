@@ -1,50 +1,86 @@
 from spiders.public.govpage.govpageSpider import Spider as PublicSpider
 from spiders.private.govpage.govpageSpider import Spider as PrivateSpider
-from bots.entities.national.national_credit_regulator.Bot import Bot as NCR_Bot
-from  bots.entities.national.community_schemes_ombud_services.Bot import Bot as CSOS_Bot
-from bots.entities.national.postbank.Bot import Bot as Postbank_Bot
-# from bots.entities.national.rainbow.Bot import Bot as Rainbow_Bot
-import time
+from bots.entities.national.rainbow.Bot import Bot as Rainbow_Bot
+from bots.engine import Bot as SpecBot
+from bots.sources import SOURCES
 import logging
 
 
+from utils.orchestrator import run_sources
+from utils.driver_pool import configure_pool, reclaim_leases, shutdown_pool
 from utils.rename_imgs_and_generate_json import rename_images_and_create_json
 from utils.rename_pdfs_and_generate_json import rename_pdfs_and_create_json
 from utils.pdf_to_image import create_images_from_pdf_pages
+from utils.pdf_text import extract_text_from_pdfs
+from pipeline.writer import shard_file
+from pipeline.sanitize import sanitize_sources
+from pipeline.dedup import deduplicate, source_files
+from pipeline.ids import assign_source_ids
+from pipeline.fields import enrich_posts
+from pipeline.compact import compact
+from pipeline.diff import diff_sources
+from pipeline.search_index import build_index
+import glob
+
+# Maximum number of spiders and bots running at the same time
+MAX_WORKERS = 4
+# Seconds a single source may run before it is abandoned
+SOURCE_TIMEOUT = 900
+SOURCE_TIMEOUTS = {
+    "govpage-public-sector": 1800,
+}
+# Pages a pooled Firefox instance may load before it is replaced
+PAGES_PER_DRIVER = 50
+# Browsers the public govpage spider may use to fetch department posts at once
+GOVPAGE_CONCURRENCY = 3
+
+def pooled(job):
+    """Wraps a source so any browser it leaves leased goes back to the pool when it ends."""
+    def run():
+        try:
+            job()
+        finally:
+            reclaim_leases()
+    return run
 
 def main():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s]: %(message)s', datefmt='%d %B %Y %H:%M:%S')
 
     try:
-        logging.info("Starting Public Spider")
-        govpage_spider = PublicSpider()
-        govpage_spider.launch()
-
-
-        # logging.info("Pausing for 10 seconds")
-        # time.sleep(10)  # pause for 10s
-
-        # logging.info("Starting Private Spider")
-        # govpage_private_spider = PrivateSpider()
-        # govpage_private_spider.launch()
-
-        # logging.info("Starting Bots")
-        # nrc_bot = NCR_Bot()
-        # nrc_bot.run()
-
-        # logging.info("Starting CSOS Bot")
-        # csos_bot = CSOS_Bot()
-        # csos_bot.run()
+        logging.info("Warming up Firefox pool")
+        # Room for one browser per source plus the public spider's extra post fetchers
+        pool_size = MAX_WORKERS + GOVPAGE_CONCURRENCY - 1
+        configure_pool(size=pool_size, pages_per_driver=PAGES_PER_DRIVER).start()
 
-        # postbank_bot = Postbank_Bot()
-        # postbank_bot.run()
+        logging.info("Starting spiders and bots")
+        run_sources({
+            "govpage-public-sector": pooled(lambda: PublicSpider(max_concurrency=GOVPAGE_CONCURRENCY).launch()),
+            "govpage-private-sector": pooled(lambda: PrivateSpider().launch()),
+            "Rainbow": pooled(lambda: Rainbow_Bot().run()),
+            # Agencies described by a spec in bots/sources.py
+            **{name: pooled(lambda spec=spec: SpecBot(spec).run()) for name, spec in SOURCES.items()},
+        }, max_workers=MAX_WORKERS, timeout=SOURCE_TIMEOUT, timeouts=SOURCE_TIMEOUTS)
+        shutdown_pool()
 
-        # rainbow_bot = Rainbow_Bot()
-        # rainbow_bot.run()
+        rename_images_and_create_json(merge_similar=True)
+        rename_pdfs_and_create_json()
+        create_images_from_pdf_pages()
+        extract_text_from_pdfs()
 
-        rename_images_and_create_json()
-        # rename_pdfs_and_create_json()
-        # create_images_from_pdf_pages()
+        # The private sources are written by the Go scrapers, slim them and give their posts stable IDs here
+        private_sources = sorted(glob.glob("database/private/*.json"))
+        sanitize_sources(private_sources)
+        assign_source_ids(private_sources)
+        # Dedup needs the PDF posts, and the shards must reflect the deduplicated files
+        sources = source_files()
+        deduplicate(sources)
+        enrich_posts(sorted(glob.glob("database/public/*.json")))
+        # Closing dates are known from here on, move closed vacancies out of the live files
+        compact(sources)
+        diff_sources(sources)
+        build_index(sources)
+        for path in sources:
+            shard_file(path)
     except Exception as e:
         logging.error(f"An error occurred while initiating bots: {e}")
 
@@ -0,0 +1,37 @@
+from pipeline.writer import PostJournal
+
+
+class Checkpoint:
+    """
+    The posts a source has already scraped on a given run date, keyed by the URL they came from.
+
+    Backed by the source's PostJournal for that date, so everything a crashed run journaled
+    is picked up again when the spider restarts the same day and only the URLs that are
+    still missing have to be fetched.
+    """
+
+    def __init__(self, source: str, run_date: str = None, directory='journal'):
+        self.journal = PostJournal(source, run_date, directory)
+        self.posts = {}
+        for record in self.journal.records():
+            # Older journals could hold a placeholder string for a page without a post
+            if isinstance(record.get("post"), dict):
+                self.posts[record["url"]] = record["post"]
+
+    def done(self, url: str) -> bool:
+        return url in self.posts
+
+    def pending(self, links: list) -> list:
+        """Filters (name, url) pairs down to the ones not fetched yet."""
+        return [(name, url) for name, url in links if url not in self.posts]
+
+    def record(self, url: str, post):
+        self.posts[url] = post
+        self.journal.append({"url": url, "post": post})
+
+    def merge(self, links: list) -> list:
+        """Returns the fetched posts for (name, url) pairs, in the order of `links`."""
+        return [self.posts[url] for _, url in links if url in self.posts]
+
+    def close(self):
+        self.journal.close()
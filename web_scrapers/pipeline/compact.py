@@ -0,0 +1,142 @@
+import os
+import re
+import sys
+import json
+from datetime import date, timedelta
+
+from pipeline.dedup import source_files
+from pipeline.fields import DATE
+from pipeline.writer import atomic_write_json
+from utils.dates import parse_date
+
+# Posts without a closing date are archived this long after they were posted
+MAX_AGE = timedelta(days=14)
+# "Closing date: 10 October 2024" and "Date posted: 11 September 2024" lines, e.g. the ones
+# pipeline/sanitize.py keeps from SA-Youth's <yth-icon text="..."> fields
+CLOSING = re.compile(r"closing\s+date\s*[:\-]?\s*(" + DATE.pattern + ")", re.IGNORECASE)
+POSTED = re.compile(r"(?:date\s+)?posted\s*(?:on\s*)?[:\-]?\s*(" + DATE.pattern + ")", re.IGNORECASE)
+# Fields that may mention the closing date, and fields holding when the post went up
+CLOSING_KEYS = ("expiryDate", "summary", "details", "content")
+POSTED_KEYS = ("postedDate", "publishedDate")
+
+
+def field_text(value) -> str:
+    if isinstance(value, list):
+        return "\n".join(part for part in value if isinstance(part, str))
+    return value if isinstance(value, str) else ""
+
+
+def expiry_date(post: dict, source: str = None):
+    """
+    The date after which a post is no longer worth showing, or None if it cannot be told.
+
+    In order: the latest closing date, from the closingDate set by pipeline/fields.py or the
+    "Closing date" lines in the post text, since a post bundling several vacancies stays until
+    the last of them closes; the end of an advertised window such as Pro-Personnel's
+    "2024-09-30 - 2024-10-30"; and finally the posted date, from a field or a "Date posted"
+    line, plus MAX_AGE.
+    """
+    closing_dates = [parse_date(post["closingDate"], source)] if post.get("closingDate") else []
+    for key in CLOSING_KEYS:
+        text = field_text(post.get(key))
+        closing_dates += [parse_date(match.group(1), source, context=text) for match in CLOSING.finditer(text)]
+    closing_dates = [closing for closing in closing_dates if closing]
+    if closing_dates:
+        return max(closing_dates)
+    window = DATE.findall(field_text(post.get("startDate")))
+    if window:
+        closing = parse_date(window[-1], source)
+        if closing:
+            return closing
+    for key in POSTED_KEYS:
+        match = DATE.search(field_text(post.get(key)))
+        posted = match and parse_date(match.group(0), source)
+        if posted:
+            return posted + MAX_AGE
+    for key in CLOSING_KEYS:
+        text = field_text(post.get(key))
+        match = POSTED.search(text)
+        posted = match and parse_date(match.group(1), source, context=text)
+        if posted:
+            return posted + MAX_AGE
+    return None
+
+
+def archive_posts(posts, source: str, archive_dir: str) -> int:
+    """
+    Appends (expiry date, post) pairs to `<archive_dir>/<YYYY-MM>/<source>.jsonl`, one
+    partition per month of expiry. Posts already in their partition are not added twice.
+
+    Returns:
+        int: Number of posts written.
+    """
+    partitions = {}
+    for expiry, post in posts:
+        partitions.setdefault(expiry.strftime("%Y-%m"), []).append((expiry, post))
+
+    written = 0
+    for month, month_posts in partitions.items():
+        path = os.path.join(archive_dir, month, f"{source}.jsonl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        archived = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                archived = {json.loads(line)["post"].get("uuid") for line in f if line.strip()}
+        with open(path, "a") as f:
+            for expiry, post in month_posts:
+                if post.get("uuid") and post["uuid"] in archived:
+                    continue
+                f.write(json.dumps({"expired": expiry.isoformat(), "post": post}, ensure_ascii=False) + "\n")
+                written += 1
+    return written
+
+
+def compact(paths, archive_dir="archive", today: date = None) -> int:
+    """
+    Moves expired posts out of the live source files into the archive.
+
+    A post has expired once the date from expiry_date is before `today`; posts whose
+    expiry cannot be told are kept. Source files are only rewritten when something expired,
+    keeping each writer's indentation.
+
+    Args:
+        paths (list): Source JSON files with a "blogPosts" list.
+        archive_dir (str): Root of the monthly archive partitions, see archive_posts.
+        today (date): Defaults to today.
+
+    Returns:
+        int: Bytes reclaimed from the live files.
+    """
+    today = today or date.today()
+    reclaimed = 0
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not data.get("blogPosts"):
+            continue
+        source = os.path.splitext(os.path.basename(path))[0]
+        live, expired = [], []
+        for post in data["blogPosts"]:
+            expiry = expiry_date(post, source)
+            if expiry is not None and expiry < today:
+                expired.append((expiry, post))
+            else:
+                live.append(post)
+        if not expired:
+            continue
+
+        archive_posts(expired, source, archive_dir)
+        before = os.path.getsize(path)
+        data["blogPosts"] = live
+        atomic_write_json(data, path, indent=2 if "private" in path else 4)
+        saved = before - os.path.getsize(path)
+        reclaimed += saved
+        print(f"{os.path.basename(path)}: archived {len(expired)} expired posts, "
+              f"{len(live)} left, {saved / 1024:.1f} KB reclaimed")
+
+    print(f"Compaction reclaimed {reclaimed / 1024:.1f} KB")
+    return reclaimed
+
+
+if __name__ == "__main__":
+    compact(sys.argv[1:] or source_files())
@@ -0,0 +1,328 @@
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+import numpy as np
+from html import unescape
+
+from pipeline.fields import extract_fields, closing_dates, find_date
+from pipeline.ids import canonical_url
+from pipeline.writer import atomic_write_json, post_title
+
+# MinHash signature length, split into LSH_BANDS bands of LSH_ROWS rows. Two posts become
+# candidates when one band matches, which happens most of the time from ~70% similarity up
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# Estimated Jaccard similarity of the content shingles above which two candidates are merged
+SIMILARITY = 0.8
+SHINGLE_WORDS = 3
+# Posts with less text than this (e.g. govpage posts that only embed a Google Drive file) are
+# too short for their similarity to mean anything, they are only matched on reference number
+MIN_WORDS = 20
+# The Mersenne prime 2**31 - 1, keeps a * x + b inside 64 bits
+MERSENNE_PRIME = (1 << 31) - 1
+
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+
+# Words that say nothing about which vacancy a post is
+STOP_WORDS = {"vacancy", "vacancies", "post", "posts", "position", "positions", "the", "of", "and", "x1", "x2"}
+
+
+def normalise(text: str) -> str:
+    """Lower case, punctuation and filler words removed, whitespace collapsed."""
+    words = re.sub(r"[^\w\s]", " ", (text or "").lower()).split()
+    return " ".join(word for word in words if word not in STOP_WORDS)
+
+
+def html_text(value: str) -> str:
+    """Text of an HTML fragment, block elements end a line so "Location: ..." lines stay separate."""
+    value = re.sub(r"<br\s*/?>|</(?:div|p|li|h[1-6]|tr)>", "\n", value, flags=re.IGNORECASE)
+    return unescape(re.sub(r"<[^>]+>", " ", value))
+
+
+def post_text(post: dict) -> str:
+    """The text of a post from any source: govpage content paragraphs or the private sources' HTML fields."""
+    parts = []
+    for key in ("content", "summary", "details"):
+        value = post.get(key)
+        for part in value if isinstance(value, list) else [value]:
+            if isinstance(part, str):
+                parts.append(html_text(part))
+    return "\n".join(parts)
+
+
+def post_url(post: dict) -> str:
+    """The canonical apply or post link of a post, "" if it has none."""
+    url = post.get("apply") or post.get("href") or ""
+    return canonical_url(url) if isinstance(url, str) and url.startswith("http") else ""
+
+
+def post_location(post: dict, found: str) -> str:
+    """The location field (a string, or Pro-Personnel's {city, region}), else the location `found` in the text."""
+    location = post.get("location")
+    if isinstance(location, dict):
+        location = " ".join(value for value in location.values() if isinstance(value, str))
+    if not isinstance(location, str) or not location.strip():
+        location = found or ""
+    return normalise(location)
+
+
+def locations_conflict(first: str, second: str) -> bool:
+    """Both known and neither contains the other, "rustenburg" and "rustenburg north west" agree."""
+    a, b = set(first.split()), set(second.split())
+    return bool(a) and bool(b) and not (a <= b or b <= a)
+
+
+def shingles(text: str) -> set:
+    """Overlapping SHINGLE_WORDS word sequences of the normalised text."""
+    words = normalise(text).split()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(shingle_set: set) -> np.ndarray:
+    """MinHash signature of a set of shingles."""
+    hashes = np.array([int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") % MERSENNE_PRIME
+                       for s in shingle_set or {""}], dtype=np.uint64)
+    return ((np.outer(hashes, _PERM_A) + _PERM_B) % MERSENNE_PRIME).min(axis=0)
+
+
+def titles_match(first: str, second: str) -> bool:
+    """One title contains all the words of the other, e.g. a re-advert, or they share most words."""
+    a, b = set(first.split()), set(second.split())
+    if not a or not b:
+        return True
+    if (a <= b or b <= a) and min(len(a), len(b)) >= 2:
+        return True
+    return len(a & b) / len(a | b) >= 0.8
+
+
+class Record:
+    """One post or PDF circular post, reduced to what the duplicate check compares."""
+
+    def __init__(self, source, index, employer, title, text, kind="post", attachment="", url="", location="",
+                 reference="", closing=()):
+        self.source = source
+        self.index = index
+        self.kind = kind
+        self.title = normalise(title)
+        self.employer = normalise(employer)
+        self.text = text
+        self.attachment = attachment
+        self.url = url
+        self.location = location
+        self.reference = normalise(reference)
+        self.closing = set(closing)  # closing dates, one per vacancy of a bundled post
+        self.shingles = shingles(text)
+        self.signature = None  # set by load_records once boilerplate is removed
+
+    @property
+    def comparable(self) -> bool:
+        return len(self.shingles) >= MIN_WORDS
+
+    def conflicts(self, other) -> bool:
+        """
+        Different reference numbers, attached files or locations mean different vacancies, and
+        so do closing dates that have no day in common, however each post writes them. Two links
+        of the same site are different vacancies too: a site lists each vacancy once, e.g.
+        SA-Youth's "opportunity=" IDs or Pro-Personnel's "vacancy_ref=".
+        """
+        if self.source == other.source and self.url and other.url and self.url != other.url:
+            return True
+        if locations_conflict(self.location, other.location):
+            return True
+        if self.closing and other.closing and not self.closing & other.closing:
+            return True
+        return any(mine and theirs and mine != theirs for mine, theirs in
+                   ((self.reference, other.reference), (self.attachment, other.attachment)))
+
+    def same_key(self, other) -> bool:
+        """Reference numbers are unique per employer, the same one under the same title or employer is the same post."""
+        return bool(self.reference) and self.reference == other.reference and \
+            (self.title == other.title or bool(self.employer) and self.employer == other.employer)
+
+
+def load_records(paths, pdf_posts_path=None):
+    """
+    Reads the posts of every source file, plus the posts extracted from PDF circulars.
+
+    Returns:
+        tuple: (records, {path: file contents})
+    """
+    records, files = [], {}
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not data.get("blogPosts"):
+            continue
+        files[path] = data
+        employer = data.get("title", "") if "private" in path else ""
+        source = os.path.splitext(os.path.basename(path))[0]
+        for i, post in enumerate(data["blogPosts"]):
+            text = post_text(post)
+            fields = extract_fields(text, source)
+            records.append(Record(path, i, employer, post_title(post), text, attachment=post.get("iframe") or "",
+                                  url=post_url(post), location=post_location(post, fields["location"]),
+                                  reference=fields["reference"] or "", closing=closing_dates(text, source)))
+
+    if pdf_posts_path and os.path.exists(pdf_posts_path):
+        with open(pdf_posts_path) as f:
+            circulars = json.load(f)
+        files[pdf_posts_path] = circulars
+        for c, circular in enumerate(circulars):
+            for p, post in enumerate(circular["posts"]):
+                # Fields utils/pdf_text.py already pulled out of the circular
+                closing = find_date(post.get("closingDate"))
+                records.append(Record(pdf_posts_path, (c, p), "", post["title"], post["text"], kind="pdf",
+                                      location=normalise(post.get("location")), reference=post.get("reference") or "",
+                                      closing=[closing] if closing else []))
+
+    remove_boilerplate(records)
+    for record in records:
+        record.signature = minhash(record.shingles)
+    return records, files
+
+
+def remove_boilerplate(records, share=0.5, min_posts=4):
+    """
+    Drops shingles that appear in more than `share` of a source's posts, such as the
+    "This text is from another website" notice on every SA-Youth post. Otherwise posts
+    from the same site look alike whatever vacancy they describe.
+    """
+    by_source = {}
+    for record in records:
+        by_source.setdefault(record.source, []).append(record)
+    for source_records in by_source.values():
+        if len(source_records) < min_posts:
+            continue
+        counts = {}
+        for record in source_records:
+            for shingle in record.shingles:
+                counts[shingle] = counts.get(shingle, 0) + 1
+        common = {shingle for shingle, count in counts.items() if count > share * len(source_records)}
+        for record in source_records:
+            record.shingles -= common
+
+
+def find_duplicates(records, similarity=SIMILARITY):
+    """
+    Groups records that describe the same vacancy, in roughly linear time.
+
+    Records only get compared when their MinHash signatures share an LSH band, or when
+    their title and reference number normalise to the same key.
+
+    Returns:
+        list: Groups (lists of record indexes) of two or more records.
+    """
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, record in enumerate(records):
+        if record.comparable:
+            for band in range(LSH_BANDS):
+                key = (band, record.signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+                buckets.setdefault(key, []).append(i)
+        if record.reference:
+            buckets.setdefault(("key", record.title, record.reference), []).append(i)
+
+    checked = set()
+    for key, members in buckets.items():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if (i, j) in checked or find(i) == find(j):
+                    continue
+                checked.add((i, j))
+                first, second = records[i], records[j]
+                if first.conflicts(second):
+                    continue
+                # PDF posts are single posts of a circular, a govpage post often retypes the whole circular
+                if "pdf" not in (first.kind, second.kind) and not titles_match(first.title, second.title):
+                    continue
+                if first.same_key(second) or (first.comparable and second.comparable and
+                                              np.mean(first.signature == second.signature) >= similarity):
+                    parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(len(records)):
+        groups.setdefault(find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def deduplicate(paths, pdf_posts_path="database/pdf_images/posts.json", similarity=SIMILARITY):
+    """
+    Removes near-duplicate posts across all source files and prints what was merged.
+
+    From each group of duplicates the post with the most text is kept. PDF circular posts
+    are never removed: a circular post that repeats a scraped post gets a "duplicateOf"
+    field holding the uuid of that post, so the frontend can skip it.
+
+    Args:
+        paths (list): Source JSON files with a "blogPosts" list.
+        pdf_posts_path (str): Posts extracted from PDF circulars, see utils/pdf_text.py.
+        similarity (float): See SIMILARITY.
+
+    Returns:
+        dict: path -> number of posts removed from it
+    """
+    records, files = load_records(paths, pdf_posts_path)
+    removed = {}  # path -> post indexes to drop
+    links = {}  # (circular, post) -> uuid of the scraped post it repeats
+    for group in find_duplicates(records, similarity):
+        posts = [i for i in group if records[i].kind == "post"]
+        if not posts:
+            continue
+        keep = max(posts, key=lambda i: len(records[i].text))
+        kept_post = files[records[keep].source]["blogPosts"][records[keep].index]
+        for i in group:
+            record = records[i]
+            if i == keep:
+                continue
+            if record.kind == "pdf":
+                links[record.index] = kept_post.get("uuid", "")
+            else:
+                removed.setdefault(record.source, set()).add(record.index)
+                print(f"Duplicate of '{post_title(kept_post)}' removed from {os.path.basename(record.source)}")
+
+    for path, indexes in removed.items():
+        data = files[path]
+        data["blogPosts"] = [post for i, post in enumerate(data["blogPosts"]) if i not in indexes]
+        # Keep each writer's indentation, the Go scrapers use 2 spaces
+        atomic_write_json(data, path, indent=2 if "private" in path else 4)
+
+    if pdf_posts_path in files:
+        changed = False
+        for c, circular in enumerate(files[pdf_posts_path]):
+            for p, post in enumerate(circular["posts"]):
+                duplicate_of = links.get((c, p))
+                if post.get("duplicateOf") != duplicate_of:
+                    post.pop("duplicateOf", None)
+                    if duplicate_of is not None:
+                        post["duplicateOf"] = duplicate_of
+                    changed = True
+        if changed:
+            atomic_write_json(files[pdf_posts_path], pdf_posts_path, indent=None, separators=(",", ":"))
+
+    counts = {path: len(indexes) for path, indexes in removed.items()}
+    print(f"Removed {sum(counts.values())} duplicate posts from {len(records)} records, "
+          f"linked {len(links)} PDF posts to scraped posts")
+    return counts
+
+
+def source_files():
+    """Every source file under database/public and database/private."""
+    return sorted(glob.glob("database/public/*.json") + glob.glob("database/private/*.json"))
+
+
+if __name__ == "__main__":
+    deduplicate(sys.argv[1:] or source_files())
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+from datetime import datetime
+
+from pipeline.dedup import source_files
+from pipeline.ids import content_hash
+from pipeline.writer import atomic_write_json
+
+
+def snapshot(paths) -> dict:
+    """{source file name: {post uuid: content hash}} for the posts currently in `paths`."""
+    state = {}
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        state[name] = {post["uuid"]: content_hash(post) for post in data.get("blogPosts", []) if post.get("uuid")}
+    return state
+
+
+def diff_snapshots(previous: dict, current: dict) -> dict:
+    """
+    Compares two snapshots.
+
+    Returns:
+        dict: Per source, the uuids of "added", "changed" and "removed" posts. Sources
+        without changes are left out.
+    """
+    changes = {}
+    for source in sorted(set(previous) | set(current)):
+        before, after = previous.get(source, {}), current.get(source, {})
+        source_changes = {
+            "added": sorted(set(after) - set(before)),
+            "changed": sorted(uuid for uuid in set(after) & set(before) if after[uuid] != before[uuid]),
+            "removed": sorted(set(before) - set(after)),
+        }
+        if any(source_changes.values()):
+            changes[source] = source_changes
+    return changes
+
+
+def diff_sources(paths, snapshot_path="database/post_snapshot.json", report_path="database/changes.json") -> dict:
+    """
+    Reports which posts were added, changed or removed since the previous run.
+
+    The report is written to `report_path` for downstream jobs (shard rebuilds, cache
+    purges) and printed per source; the current state then becomes the snapshot the next
+    run is compared against.
+
+    Args:
+        paths (list): Source JSON files.
+        snapshot_path (str): Post hashes of the previous run.
+        report_path (str): Where the report is written.
+
+    Returns:
+        dict: See diff_snapshots.
+    """
+    previous = {}
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            previous = json.load(f)
+    current = snapshot(paths)
+    changes = diff_snapshots(previous, current)
+
+    atomic_write_json({"generated": datetime.now().isoformat(timespec="seconds"), "sources": changes}, report_path)
+    atomic_write_json(current, snapshot_path, indent=None)
+
+    for source, source_changes in changes.items():
+        counts = ", ".join(f"{len(uuids)} {kind}" for kind, uuids in source_changes.items())
+        print(f"{source}: {counts}")
+    if not changes:
+        print("No posts changed since the last run")
+    return changes
+
+
+if __name__ == "__main__":
+    diff_sources(sys.argv[1:] or source_files())
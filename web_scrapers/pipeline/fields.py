@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+import glob
+import json
+
+from pipeline.writer import atomic_write_json
+from utils.dates import parse_date as parse_any_date
+
+# A labelled line, "Label value", "Label: value", "Label - value" or "Label #: value"
+LABEL = r"^[ \t]*(?:{labels})\b[ \t]*(?:#[ \t]*)?[:\-–][ \t]*(?P<value>[^\n]+)$|^[ \t]*(?:{labels})[ \t]+(?P<bare>[^\n:\-–][^\n]*)$"
+
+
+def labelled(*labels):
+    alternatives = "|".join(labels)
+    return re.compile(LABEL.format(labels=alternatives), re.IGNORECASE | re.MULTILINE)
+
+
+CLOSING_DATE = labelled(r"closing\s+date", r"closing")
+LOCATION = labelled(r"location", r"centre", r"center", r"place\s+of\s+work", r"based\s+at", r"region")
+SALARY = labelled(r"remuneration(?:\s+scale)?", r"salary(?:\s+scale)?", r"package", r"stipend")
+REFERENCE = labelled(r"(?:job\s+)?ref(?:erence)?\.?(?:\s+(?:no|number|num)\.?)?", r"job\s+(?:number|id)", r"vacancy\s+number")
+# SA-Youth's "Reference number - Tap to copy" label has the value on the next line
+COPY_REFERENCE = re.compile(r"tap\s+to\s+copy\s+([\w/\-.]+)", re.IGNORECASE)
+EMPLOYMENT = labelled(r"(?:assignment|job|employment|contract|position)\s+type", r"nature\s+of\s+(?:employment|appointment)",
+                      r"type\s+of\s+(?:employment|contract)", r"employment")
+
+# Rand amounts: "R 217,920.00", "R993 593,00", "R1,126,237"
+AMOUNT = re.compile(r"R\s?(\d{1,3}(?:[ ,.\u00a0]\d{3})*(?:[.,]\d{2})?|\d+(?:[.,]\d{2})?)(?!\d)")
+# A date inside a longer value, "2024-10-10", "30/9/2024", "10-Oct-2024", "30th September, 2024", "Oct 7, 2024"
+DATE = re.compile(r"\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[/.-]\d{1,2}[/.-]\d{4}"
+                  r"|\d{1,2}(?:st|nd|rd|th)?[ -][A-Za-z]{3,9},?[ -]\d{4}|[A-Za-z]{3,9} \d{1,2}(?:st|nd|rd|th)?, ?\d{4}")
+# Most specific first, "Fixed Term Contract" is fixed-term, not contract
+EMPLOYMENT_TYPES = (
+    ("internship", re.compile(r"\bintern(?:ship)?s?\b", re.IGNORECASE)),
+    ("learnership", re.compile(r"\blearnership", re.IGNORECASE)),
+    ("fixed-term", re.compile(r"\bfixed[\s-]+term\b|\b\d+\s*(?:\(\w+\)\s*)?(?:months?|years?)\s+contract", re.IGNORECASE)),
+    ("contract", re.compile(r"\bcontract\b", re.IGNORECASE)),
+    ("temporary", re.compile(r"\btemp(?:orary)?\b", re.IGNORECASE)),
+    ("part-time", re.compile(r"\bpart[\s-]*time\b", re.IGNORECASE)),
+    ("permanent", re.compile(r"\bpermanent\b", re.IGNORECASE)),
+)
+
+
+def first_value(pattern, text):
+    match = pattern.search(text)
+    if not match:
+        return None
+    return (match.group("value") or match.group("bare")).strip()
+
+
+def parse_amount(raw: str) -> float:
+    """"217,920.00" -> 217920.0, "993 593,00" -> 993593.0; a comma or dot before two final digits is decimal."""
+    raw = raw.replace("\u00a0", " ")
+    decimals = re.search(r"[.,](\d{2})$", raw)
+    whole = raw[:decimals.start()] if decimals else raw
+    value = float(re.sub(r"[ ,.]", "", whole))
+    return value + int(decimals.group(1)) / 100 if decimals else value
+
+
+def closing_dates(text: str, source: str = None) -> list:
+    """Every "Closing date" of the post as a date, in order. A govpage post often bundles several vacancies."""
+    dates = []
+    for match in CLOSING_DATE.finditer(text):
+        # Ambiguous dates are read the way the rest of this post writes its dates
+        parsed = find_date(match.group("value") or match.group("bare"), source, context=text)
+        if parsed:
+            dates.append(parsed)
+    return dates
+
+
+def reference(text: str):
+    value = first_value(REFERENCE, text)
+    if value and value.lower().startswith("tap to copy"):
+        match = COPY_REFERENCE.search(text)
+        return match.group(1) if match else None
+    return value
+
+
+def find_date(value: str, source: str = None, context: str = None):
+    """The first date in `value`, e.g. "10 October 2024 at 12:00", or None. See utils/dates.py for the formats."""
+    match = DATE.search(value or "")
+    return parse_any_date(match.group(0), source, context) if match else None
+
+
+def parse_date(value: str, source: str = None, context: str = None):
+    """The first date in `value` as YYYY-MM-DD, or None."""
+    parsed = find_date(value, source, context)
+    return parsed.isoformat() if parsed else None
+
+
+def employment_type(text: str):
+    for name, pattern in EMPLOYMENT_TYPES:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def extract_fields(text: str, source: str = None) -> dict:
+    """
+    Pulls typed fields out of the free text of a post.
+
+    Args:
+        text (str): The post text.
+        source (str): Where the post comes from, the date parser learns each source's date format.
+
+    Returns:
+        dict: "closingDate" (YYYY-MM-DD, the latest of the post's vacancies), "location", "salaryMin" and "salaryMax" (rand),
+        "reference" and "employmentType" (internship, learnership, fixed-term, contract,
+        temporary, part-time or permanent). Fields that are not found are None.
+    """
+    salary_text = first_value(SALARY, text) or ""
+    amounts = [parse_amount(amount) for amount in AMOUNT.findall(salary_text)]
+    employment = first_value(EMPLOYMENT, text)
+    dates = closing_dates(text, source)
+    return {
+        # A post is worth showing until the last of its vacancies closes
+        "closingDate": max(dates).isoformat() if dates else None,
+        "location": first_value(LOCATION, text),
+        "salaryMin": min(amounts) if amounts else None,
+        "salaryMax": max(amounts) if amounts else None,
+        "reference": reference(text),
+        # The labelled line is most reliable, otherwise look for the words anywhere in the post
+        "employmentType": (employment and employment_type(employment)) or employment_type(text),
+    }
+
+
+def enrich_posts(paths) -> int:
+    """
+    Adds the extracted fields to every BlogPost() record of govpage source files.
+
+    Returns:
+        int: Number of posts with at least one field found.
+    """
+    found = 0
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not data.get("blogPosts"):
+            continue
+        source = os.path.splitext(os.path.basename(path))[0]
+        for post in data["blogPosts"]:
+            fields = extract_fields("\n".join(post.get("content") or []), source)
+            post.update(fields)
+            found += any(value is not None for value in fields.values())
+        atomic_write_json(data, path)
+    print(f"Extracted fields from {found} posts")
+    return found
+
+
+if __name__ == "__main__":
+    enrich_posts(sys.argv[1:] or sorted(glob.glob("database/public/*.json")))
@@ -0,0 +1,101 @@
+import os
+import json
+import hashlib
+from html import unescape
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from pipeline.writer import atomic_write_json
+
+# Query parameters that only say how a visitor got to a page, not which page it is
+IGNORED_PARAMS = {"fbclid", "gclid", "sourceParams", "sourceUri"}
+# Hex digits of the hash kept in an ID
+ID_DIGITS = 16
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalises a post URL so every way of writing it gives the same string: https, lower case
+    host, no default port, fragment, tracking parameters or trailing slash, sorted query.
+    """
+    # Scraped hrefs sometimes keep their HTML escaping, e.g. "&amp;" between parameters
+    parts = urlsplit(unescape(url.strip()))
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in IGNORED_PARAMS and not key.startswith("utm_"))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def content_hash(post: dict) -> str:
+    """SHA-256 of a post's fields, except its ID, independent of key order."""
+    fields = {key: value for key, value in post.items() if key != "uuid"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def post_id(prefix: str, url: str = "", post: dict = None) -> str:
+    """
+    Deterministic ID of a post, the same on every run.
+
+    The ID is derived from the post's canonical URL, so editing a post keeps its ID (and
+    share links keep working); the diff stage notices the edit through content_hash. Posts
+    without a URL fall back to the hash of their content.
+
+    Args:
+        prefix (str): Source prefix, "p" for govpage public sector posts, "gov-" for private sector.
+        url (str): The post URL.
+        post (dict): The post, used when there is no URL.
+
+    Returns:
+        str: e.g. "p3f9a0c2d41b7e8aa"
+    """
+    if url:
+        digest = hashlib.sha256(canonical_url(url).encode()).hexdigest()
+    else:
+        digest = content_hash(post or {})
+    return prefix + digest[:ID_DIGITS]
+
+
+def assign_ids(data: dict, prefix: str, url_keys=("href", "apply", "link")) -> int:
+    """
+    Replaces the random uuids the Go scrapers give posts with deterministic ones.
+
+    Args:
+        data (dict): Source file contents with a "blogPosts" list.
+        prefix (str): Prefix of the IDs, e.g. "p".
+        url_keys (tuple): Post fields holding the post URL, the first one set is used.
+
+    Returns:
+        int: Number of posts whose uuid changed.
+    """
+    changed = 0
+    seen = set()
+    for post in data.get("blogPosts", []):
+        url = next((post[key] for key in url_keys if isinstance(post.get(key), str) and post[key].startswith("http")), "")
+        uuid = post_id(prefix, url, post)
+        if uuid in seen:
+            # Two posts sharing a link, e.g. a generic careers page, tell them apart by content
+            uuid = prefix + hashlib.sha256((uuid + content_hash(post)).encode()).hexdigest()[:ID_DIGITS]
+        seen.add(uuid)
+        if post.get("uuid") != uuid:
+            post["uuid"] = uuid
+            changed += 1
+    return changed
+
+
+def assign_source_ids(paths, indent=2):
+    """
+    Gives the posts of source files written by the Go scrapers deterministic IDs, prefixed
+    with the file name, e.g. "sa-youth-3f9a0c2d41b7e8aa". Files are only rewritten if an ID changed.
+    """
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            continue
+        prefix = os.path.splitext(os.path.basename(path))[0].lower() + "-"
+        changed = assign_ids(data, prefix)
+        if changed:
+            atomic_write_json(data, path, indent=indent)
+            print(f"Assigned {changed} post IDs in {os.path.basename(path)}")
@@ -0,0 +1,219 @@
+import os
+import re
+import sys
+import glob
+import json
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from pipeline.writer import atomic_write_json
+
+# Elements kept as they are, without attributes (except href on links)
+KEEP_TAGS = {"a", "p", "br", "ul", "ol", "li", "strong", "b", "em", "i", "u",
+             "h1", "h2", "h3", "h4", "h5", "h6", "table", "thead", "tbody", "tr", "td", "th", "blockquote"}
+# Layout containers, replaced by a bare <div> so their text still starts on its own line
+BLOCK_TAGS = {"div", "section", "article", "header", "footer", "main", "yth-stack", "yth-section"}
+# Elements dropped together with everything inside them: scripts, forms and site chrome
+DROP_TAGS = {"script", "style", "svg", "noscript", "template", "form", "input", "button", "select", "textarea",
+             "iframe", "yth-navbar", "yth-button-group", "yth-button-legacy", "yth-tooltip"}
+# Elements showing their `text` attribute, kept as a line of plain text and dropped when they
+# have none. SA-Youth puts "Location: ...", "Closing date: ...", "Salary: ..." in <yth-icon text="...">
+TEXT_ATTRIBUTE_TAGS = {"yth-icon"}
+# Elements hidden on the source site, e.g. Bootstrap's "d-none", dialogs and toast messages
+DROP_CLASSES = {"d-none", "modal", "toast"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Any other element (span, yth-button, yth-badge, ...) is unwrapped, only its text is kept
+
+HTML_PATTERN = re.compile(r"<[a-zA-Z/!][^>]*>")
+LINK_SCHEMES = ("http://", "https://", "mailto:", "tel:")
+
+
+class Sanitizer(HTMLParser):
+    """
+    Rebuilds scraped markup as a small tree of semantic elements.
+
+    Layout-only elements and all attributes other than link targets are dropped, relative
+    links are resolved against `base_url` and text whitespace is collapsed.
+    """
+
+    def __init__(self, base_url=""):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.root = ["", {}, []]
+        self.stack = [self.root]  # open output elements
+        self.open_tags = []  # (source tag, output element or None, dropping) of the open source elements
+        self.dropping = 0  # depth inside dropped elements
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+        text = (attrs.get("text") or "").strip() if tag in TEXT_ATTRIBUTE_TAGS else ""
+        drop = self.dropping or tag in DROP_TAGS or bool(classes & DROP_CLASSES) or \
+            (tag in TEXT_ATTRIBUTE_TAGS and not text)
+
+        element = None
+        if not drop:
+            href = attrs.get("href")
+            if tag == "a" or (href and tag.startswith("yth-button")):
+                href = urljoin(self.base_url, href or "")
+                element = ["a", {"href": href} if href.startswith(LINK_SCHEMES) else {}, []]
+            elif text:
+                element = ["div", {}, [text]]
+            elif tag in KEEP_TAGS:
+                element = [tag, {}, []]
+            elif tag in BLOCK_TAGS:
+                element = ["div", {}, []]
+            if element is not None:
+                self.stack[-1][2].append(element)
+
+        if tag in VOID_TAGS:
+            return
+        if drop:
+            self.dropping += 1
+        elif element is not None:
+            self.stack.append(element)
+        self.open_tags.append((tag, element, drop))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Close any unclosed children of `tag`, ignore stray end tags
+        for depth in range(len(self.open_tags) - 1, -1, -1):
+            if self.open_tags[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.open_tags) > depth:
+            _, element, drop = self.open_tags.pop()
+            if drop:
+                self.dropping -= 1
+            elif element is not None:
+                self.stack.pop()
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.stack[-1][2].append(data)
+
+
+def serialize(children):
+    """
+    Writes the tree back as HTML, leaving out elements with no text and needless wrappers.
+
+    Children are written before their parent decides whether a <div> is its only child, so
+    every level of single-child wrappers goes in one pass and sanitising the output again
+    gives the same HTML.
+    """
+    rendered = []  # (tag or None for text, attributes, written contents)
+    for child in children:
+        if isinstance(child, str):
+            rendered.append((None, {}, escape(re.sub(r"\s+", " ", child), quote=False)))
+        elif child[0] == "br":
+            rendered.append(("br", {}, ""))
+        else:
+            tag, attrs, grandchildren = child
+            inner = serialize(grandchildren).strip()
+            if inner:
+                rendered.append((tag, attrs, inner))
+    significant = [item for item in rendered if item[0] is not None or item[2].strip()]
+
+    parts = []
+    for tag, attrs, inner in rendered:
+        if tag is None:
+            parts.append(inner)
+        elif tag == "br":
+            parts.append("<br>")
+        elif tag == "div" and len(significant) == 1:
+            # The only child of its parent, the parent already puts it on its own line
+            parts.append(inner)
+        else:
+            attributes = "".join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+            parts.append(f"<{tag}{attributes}>{inner}</{tag}>")
+    return re.sub(r" {2,}", " ", "".join(parts))
+
+
+def sanitize_html(markup, base_url=""):
+    """
+    Strips layout-only tags and attributes from a piece of HTML, keeping its text and links.
+
+    Args:
+        markup (str): The scraped HTML.
+        base_url (str): URL relative links are resolved against.
+
+    Returns:
+        str: The slimmed HTML.
+    """
+    parser = Sanitizer(base_url)
+    parser.feed(markup)
+    parser.close()
+    html = serialize(parser.root[2]).strip()
+    # No spaces between block elements
+    return re.sub(r"\s*(</?(?:div|p|ul|ol|li|h[1-6]|table|thead|tbody|tr|td|th|blockquote)>|<br>)\s*", r"\1", html)
+
+
+def sanitize_value(value, base_url=""):
+    """Sanitises a string that contains markup, or each such string in a list. Plain text is left alone."""
+    if isinstance(value, list):
+        return [sanitize_value(item, base_url) for item in value]
+    if isinstance(value, str) and HTML_PATTERN.search(value):
+        return sanitize_html(value, base_url)
+    return value
+
+
+def sanitize_post(post: dict) -> dict:
+    """Sanitises every field of a post that contains markup, e.g. minopex's list of "details" sections."""
+    base_url = post.get("apply") or post.get("href") or ""
+    base_url = base_url if isinstance(base_url, str) and base_url.startswith(("http://", "https://")) else ""
+    return {key: sanitize_value(value, base_url) for key, value in post.items()}
+
+
+def sanitize_file(path: str, indent=2) -> tuple:
+    """
+    Sanitises the posts of a source file in place.
+
+    Args:
+        path (str): A database JSON file with a "blogPosts" list.
+        indent (int): JSON indentation, the Go scrapers write 2. Defaults to 2.
+
+    Returns:
+        tuple: (bytes before, bytes after)
+    """
+    before = os.path.getsize(path)
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not data.get("blogPosts"):
+        return before, before
+    posts = [sanitize_post(post) for post in data["blogPosts"]]
+    if posts == data["blogPosts"]:
+        # Nothing to strip, leave the file as its scraper wrote it
+        return before, before
+    data["blogPosts"] = posts
+    atomic_write_json(data, path, indent=indent)
+    return before, os.path.getsize(path)
+
+
+def sanitize_sources(paths) -> dict:
+    """
+    Sanitises several source files and prints how much smaller each one got.
+
+    Returns:
+        dict: path -> (bytes before, bytes after)
+    """
+    report = {}
+    for path in paths:
+        try:
+            report[path] = sanitize_file(path)
+        except Exception as e:
+            print(f"Could not sanitise {path}: {e}")
+            continue
+        before, after = report[path]
+        saved = 100 * (before - after) / before if before else 0
+        if before == after:
+            print(f"Sanitised {os.path.basename(path)}: no markup to strip")
+            continue
+        print(f"Sanitised {os.path.basename(path)}: {before // 1024} KB -> {after // 1024} KB ({saved:.0f}% smaller)")
+    return report
+
+
+if __name__ == "__main__":
+    sanitize_sources(sys.argv[1:] or sorted(glob.glob("database/private/*.json")))
@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import json
+import math
+from bisect import bisect_left
+from collections import Counter
+
+from pipeline.dedup import post_text, source_files
+from pipeline.writer import atomic_write_json, post_title
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+              "or", "the", "to", "with", "will", "this", "that", "you", "your", "our", "we", "all", "must"}
+# A word in a title counts as much as this many words in the body
+TITLE_WEIGHT = 3
+
+
+def tokenize(text: str) -> list:
+    return [token for token in TOKEN.findall((text or "").lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def collect_documents(paths, pdf_posts_path="database/pdf_images/posts.json"):
+    """Yields (id, source, title, text) for every post, including posts extracted from PDF circulars."""
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            continue
+        source = os.path.splitext(os.path.basename(path))[0]
+        for post in data.get("blogPosts", []):
+            yield post.get("uuid", ""), source, post_title(post), post_text(post)
+
+    if pdf_posts_path and os.path.exists(pdf_posts_path):
+        with open(pdf_posts_path) as f:
+            circulars = json.load(f)
+        for circular in circulars:
+            for i, post in enumerate(circular["posts"]):
+                # Already searchable through the scraped post it repeats
+                if not post.get("duplicateOf"):
+                    yield f"{circular['file']}#{i + 1}", "pdf", post["title"], post["text"]
+
+
+def build_index(paths, index_path="database/search_index.json", pdf_posts_path="database/pdf_images/posts.json"):
+    """
+    Builds an inverted index of the titles and text of every post.
+
+    The file holds a document table and, per term, a flat list of (document number, weight)
+    pairs sorted by document number, with compact separators.
+
+    Args:
+        paths (list): Source JSON files.
+        index_path (str): Where the index is written.
+        pdf_posts_path (str): Posts extracted from PDF circulars, see utils/pdf_text.py.
+
+    Returns:
+        dict: The index.
+    """
+    documents = []
+    postings = {}
+    for doc_id, source, title, text in collect_documents(paths, pdf_posts_path):
+        number = len(documents)
+        documents.append({"id": doc_id, "source": source, "title": title})
+        weights = Counter(tokenize(text))
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for term, weight in weights.items():
+            postings.setdefault(term, []).extend((number, weight))
+
+    index = {"documents": documents, "postings": dict(sorted(postings.items()))}
+    atomic_write_json(index, index_path, indent=None, separators=(",", ":"))
+    print(f"Indexed {len(documents)} posts, {len(postings)} terms: {index_path}")
+    return index
+
+
+class SearchIndex:
+    """
+    Query API over an index written by build_index.
+
+    Postings are decoded into dicts once, when a term is first looked up, so a lookup is a
+    few dict operations regardless of how many posts are indexed.
+    """
+
+    def __init__(self, index: dict):
+        self.documents = index["documents"]
+        self._raw = index["postings"]
+        self._postings = {}
+        self.terms = sorted(self._raw)  # for prefix lookups
+
+    @classmethod
+    def load(cls, index_path="database/search_index.json"):
+        with open(index_path) as f:
+            return cls(json.load(f))
+
+    def postings(self, term: str) -> dict:
+        """Document number -> weight for one term."""
+        found = self._postings.get(term)
+        if found is None:
+            flat = self._raw.get(term, [])
+            found = self._postings[term] = dict(zip(flat[::2], flat[1::2]))
+        return found
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """Indexed terms starting with `prefix`, the most common first, for autocomplete."""
+        prefix = prefix.lower()
+        start = bisect_left(self.terms, prefix)
+        matches = []
+        for term in self.terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return sorted(matches, key=lambda term: -len(self._raw[term]))[:limit]
+
+    def search(self, query: str, limit: int = 20, prefix: bool = False) -> list:
+        """
+        Finds the posts containing every word of `query`, best matches first.
+
+        Args:
+            query (str): Keywords, e.g. "nurse polokwane".
+            limit (int): Most results to return. Defaults to 20.
+            prefix (bool): Treat the last word as a prefix, for search-as-you-type. Defaults to False.
+
+        Returns:
+            list: Document dicts (id, source, title) with a "score".
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        groups = [[token] for token in tokens]
+        if prefix:
+            groups[-1] = self.complete(tokens[-1], limit=50) or [tokens[-1]]
+
+        scores = None
+        total = len(self.documents)
+        for group in groups:
+            # A word matches if any of its terms (several for a prefix) matches
+            matched = {}
+            for term in group:
+                postings = self.postings(term)
+                idf = math.log(1 + total / (1 + len(postings)))
+                for number, weight in postings.items():
+                    matched[number] = max(matched.get(number, 0), weight * idf)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {number: score + matched[number] for number, score in scores.items() if number in matched}
+            if not scores:
+                return []
+
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [{**self.documents[number], "score": round(score, 3)} for number, score in best]
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["build"] or len(sys.argv) == 1:
+        build_index(source_files())
+    else:
+        index = SearchIndex.load()
+        for result in index.search(" ".join(sys.argv[1:]), prefix=True):
+            print(f"{result['score']:>8}  {result['source']:<24} {result['title']}")
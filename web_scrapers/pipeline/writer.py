@@ -1,16 +1,180 @@
+import html
 import json
 import os
+import re
+import tempfile
+from datetime import date
+
+
+def atomic_write_json(data, path: str, indent=4, separators=None):
+    """
+    Writes `data` as JSON to `path` without ever leaving a half-written file behind.
+
+    The JSON goes to a temporary file in the same directory, which is flushed to disk
+    and then renamed over `path`, so readers see either the old file or the new one.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent, separators=separators)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 def GovPageJsonFile(data: dict, path='database/public/govpage.json'):
-   
-    with open(path, "w") as f:
-        json.dump([data], f, indent=4)
-        print(f"Data written to: {path}")
+
+    atomic_write_json([data], path)
+    print(f"Data written to: {path}")
 
 # Create JSON file
 def GovPageFile(data: dict, file_name):
     path = f'database/public/{file_name}.json'
-    
-    with open(path, "w") as f:
-        f.write(json.dumps(data, indent=4))
-        print(f"Data written to: {path}")
+
+    atomic_write_json(data, path)
+    print(f"Data written to: {path}")
+    write_shards(data, path)
+
+
+# Same page size as POSTS_PER_PAGE in src/components/home/HomePage.jsx
+POSTS_PER_SHARD = 10
+
+
+def post_title(post: dict) -> str:
+    """
+    Title of a post from any source: govpage posts use "title", most private sources "jobTitle",
+    and SA-Youth only has the title as the first heading of its HTML "summary".
+    """
+    title = post.get("title") or post.get("jobTitle")
+    if not title and post.get("summary"):
+        match = re.search(r"<h3[^>]*>(.*?)</h3>", post["summary"], re.DOTALL)
+        title = html.unescape(re.sub(r"<[^>]+>|\s+", " ", match.group(1))).strip() if match else ""
+    return title or ""
+
+
+def write_shards(data: dict, path: str, per_shard: int = POSTS_PER_SHARD):
+    """
+    Splits the blogPosts of a source file into fixed-size page shards plus a small index.
+
+    For `database/public/govpage-public-sector.json` the shards are written to
+    `database/public/govpage-public-sector/page-1.json`, `page-2.json`, ... and the index to
+    `database/public/govpage-public-sector/index.json`. The index carries the file's other
+    fields (title, iconLink, departments, ...), the post count and, per shard, its URL and
+    post titles, so the first page can be shown after fetching the index and one shard.
+    Shards left over from a longer previous run are deleted.
+
+    Args:
+        data (dict): The source file contents, with a "blogPosts" list.
+        path (str): Where the full file is written, under database/.
+        per_shard (int): Posts per shard. Defaults to POSTS_PER_SHARD.
+    """
+    directory = os.path.splitext(path)[0]
+    # database/public/x.json is served as /assets/public/x.json
+    url_prefix = "/assets/" + os.path.relpath(directory, "database").replace(os.sep, "/")
+    posts = data.get("blogPosts", [])
+    pages = []
+    for number, start in enumerate(range(0, len(posts), per_shard), start=1):
+        shard = posts[start:start + per_shard]
+        atomic_write_json(shard, os.path.join(directory, f"page-{number}.json"), indent=None, separators=(",", ":"))
+        pages.append({
+            "url": f"{url_prefix}/page-{number}.json",
+            "count": len(shard),
+            "titles": [post_title(post) for post in shard],
+        })
+
+    index = {key: value for key, value in data.items() if key != "blogPosts"}
+    index.update({"count": len(posts), "pageSize": per_shard, "pages": pages})
+    atomic_write_json(index, os.path.join(directory, "index.json"), indent=None, separators=(",", ":"))
+
+    for name in os.listdir(directory):
+        number = name[len("page-"):-len(".json")] if name.startswith("page-") and name.endswith(".json") else ""
+        if number.isdigit() and int(number) > len(pages):
+            os.remove(os.path.join(directory, name))
+    print(f"Wrote {len(pages)} shards of {per_shard} posts to: {directory}")
+
+
+def shard_file(path: str, per_shard: int = POSTS_PER_SHARD):
+    """Shards a source file written by another program, e.g. the Go scrapers' database/private files."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        write_shards(data, path, per_shard)
+
+
+class PostJournal:
+    """
+    Append-only JSON Lines journal of the posts a spider scraped in one run.
+
+    Each post is written as one line the moment it is scraped, so a run costs O(n) bytes
+    instead of rewriting the whole source file after every post, and a crash loses at most
+    the unsynced tail. Lines are fsynced in batches of `fsync_every`. The full source file
+    is written once, atomically, with GovPageFile when the run finishes.
+    """
+
+    def __init__(self, file_name: str, run_date: str = None, directory='journal', fsync_every=10):
+        run_date = run_date or date.today().isoformat()
+        self.path = os.path.join(directory, file_name, f"{run_date}.jsonl")
+        self.fsync_every = fsync_every
+        self._unsynced = 0
+        self._file = None
+
+    def _truncate_torn_tail(self):
+        """Cuts a last line left incomplete by a crash, so the next record starts on a line of its own."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                f.truncate(position)
+
+    def append(self, record: dict):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._truncate_torn_tail()
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def records(self) -> list:
+        """Reads the journal back, skipping lines cut short by a crash."""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
@@ -0,0 +1,154 @@
+import re
+import logging
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urljoin
+
+from spiders.types.types import BlogPost
+from utils.http_session import get_session
+
+# Elements that never have a closing tag
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Elements whose text starts on a new line when rendered
+BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "table", "tr", "blockquote"}
+
+
+class GovPagePostParser(HTMLParser):
+    """
+    Single pass parser for the static Weebly markup of a govpage blog post.
+
+    Collects the same fields the spiders read through Selenium: the first
+    `.blog-title-link.blog-link`, `.blog-date > .date-text`, the `alt="Picture"`
+    image, `.blog-content > .paragraph` texts and Google Drive iframes.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # (tag, classes) of the open elements
+        self.has_post = False
+        self.title = None
+        self.href = None
+        self.date = None
+        self.img_src = None
+        self.paragraphs = []
+        self.iframes = []
+        self._capture = None  # (field, depth, text parts) while inside a captured element
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+        parent = self.stack[-1][1] if self.stack else set()
+
+        if "blog-post" in classes:
+            self.has_post = True
+        if tag == "img" and attrs.get("alt") == "Picture" and self.img_src is None:
+            self.img_src = attrs.get("src")
+        if tag == "iframe" and "drive.google" in (attrs.get("src") or ""):
+            self.iframes.append(attrs["src"])
+
+        if self._capture is not None:
+            if tag == "br" or tag in BLOCK_TAGS:
+                self._capture[2].append("\n")
+        elif tag == "a" and {"blog-title-link", "blog-link"} <= classes and self.title is None:
+            self.href = attrs.get("href")
+            self._capture = ("title", len(self.stack), [])
+        elif "date-text" in classes and "blog-date" in parent and self.date is None:
+            self._capture = ("date", len(self.stack), [])
+        elif "paragraph" in classes and "blog-content" in parent:
+            self._capture = ("paragraph", len(self.stack), [])
+
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, classes))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if self._capture is not None and tag in BLOCK_TAGS:
+            self._capture[2].append("\n")
+        # Weebly markup is mostly well formed; close any unclosed children of `tag`
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                del self.stack[depth:]
+                break
+        else:
+            return
+        if self._capture is not None and len(self.stack) <= self._capture[1]:
+            field, _, parts = self._capture
+            self._capture = None
+            text = rendered_text("".join(parts))
+            if field == "title":
+                self.title = text
+            elif field == "date":
+                self.date = text
+            else:
+                self.paragraphs.append(text)
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._capture[2].append(data)
+
+
+def rendered_text(raw: str) -> str:
+    """Approximates Selenium's `.text`: HTML whitespace collapsed, line breaks kept, lines trimmed."""
+    lines = (re.sub(r"[ \t\r\f\v\u00a0]+", " ", line).strip() for line in raw.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_post(html: str, url: str, require_content: bool = True) -> Optional[dict]:
+    """
+    Builds a BlogPost() dict from the HTML of a govpage post.
+
+    Args:
+        html (str): The page markup.
+        url (str): The page URL, used to resolve relative links.
+        require_content (bool): Treat a post with neither paragraphs nor a Drive iframe
+            as JavaScript-rendered. Defaults to True.
+
+    Returns:
+        dict: The post, or None when the markup lacks what the spiders need and the
+        page has to be loaded in a browser instead.
+    """
+    parser = GovPagePostParser()
+    parser.feed(html)
+    parser.close()
+
+    if not parser.has_post or not parser.title or parser.date is None:
+        return None
+    if require_content and not parser.paragraphs and not parser.iframes:
+        return None
+
+    blog_post = BlogPost()
+    blog_post["imgSrc"] = urljoin(url, parser.img_src) if parser.img_src else ""
+    blog_post["title"] = parser.title
+    blog_post["href"] = urljoin(url, parser.href or "")
+    blog_post["postedDate"] = parser.date
+    blog_post["content"] = parser.paragraphs
+    if not parser.paragraphs and parser.iframes:
+        blog_post["iframe"] = parser.iframes[0]
+    return blog_post
+
+
+def fetch_post(url: str, require_content: bool = True, timeout: float = 15) -> Optional[dict]:
+    """
+    Fetches a govpage post over plain HTTP, without a browser.
+
+    Args:
+        url (str): The post URL.
+        require_content (bool): See parse_post. Defaults to True.
+        timeout (float): Request timeout in seconds. Defaults to 15.
+
+    Returns:
+        dict: The post, or None if the request failed or the page needs a browser.
+    """
+    try:
+        response = get_session().get(url, timeout=timeout)
+    except Exception as e:
+        logging.warning(f"HTTP fetch of {url} failed, falling back to browser: {e}")
+        return None
+    if response.status_code != 200:
+        logging.warning(f"HTTP fetch of {url} returned {response.status_code}, falling back to browser")
+        return None
+    post = parse_post(response.text, response.url, require_content)
+    if post is None:
+        logging.info(f"{url} needs JavaScript, falling back to browser")
+    return post
@@ -1,24 +1,21 @@
 import re
 import sys
-import uuid
-import time
 import logging
-import os
-import json
 from typing import List, Optional, Dict
 from datetime import datetime
-from selenium import webdriver
 from pipeline.writer import GovPageFile
+from pipeline.checkpoint import Checkpoint
+from pipeline.ids import post_id
+from utils.orchestrator import abandoned
+from utils.driver_pool import lease_driver
+from utils.readiness import wait_for_selector
+from spiders.common.govpage_http import fetch_post
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from ...types.types import Links, BlogPost
 
-# Initialize global variables
-govPageLinks: Dict[str, dict] = Links()  # Ensure this is initialized properly
-govPageLinks["businesses"] = {}
-
 class Spider:
     Name = "govpage-private-sector"
 
@@ -27,29 +24,21 @@ class Spider:
             "https://www.govpage.co.za/",
             "https://www.govpage.co.za/latest-govpage-updates"
         ]
-        # WebDriver options
-        opt = webdriver.FirefoxOptions()
-        opt.add_argument("--headless")  # Enable headless for production
-        self.driver = webdriver.Firefox(options=opt)
-        self.driver.set_window_size(768, 1024)
+        # Lease a warm headless Firefox from the shared pool
+        self.driver = lease_driver(window_size=(768, 1024))
 
         # Initialize scraper state
-        self.state_file = 'state.json'
-        govPageLinks["businesses"] = {}
-        self.current_business_index = 0
-
-    def save_progress(self):
-        """Save the current state of the scraper to a file."""
-        state = {
-            'govPageLinks': govPageLinks,
-            'current_business_index': self.current_business_index
-        }
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f)
+        self.govPageLinks: Dict[str, dict] = Links()
+        self.govPageLinks["businesses"] = {}
+        # Posts already scraped today, so a restarted run only fetches what is missing
+        self.checkpoint = Checkpoint(self.Name)
 
     def save_data(self):
         """Save the current state data."""
-        GovPageFile(govPageLinks, "govpage-private-sector")
+        if abandoned():
+            log.warning(f"{self.Name} timed out, not writing its posts")
+            return
+        GovPageFile(self.govPageLinks, "govpage-private-sector")
 
     def launch(self):
         """Launch the scraper."""
@@ -99,7 +88,7 @@ class Spider:
                 yes: bool = re.search(pattern, text, re.IGNORECASE)
 
                 if yes:
-                    govPageLinks["title"] = self.Name
+                    self.govPageLinks["title"] = self.Name
                     vacanciesLink = e.get_attribute("href")
                     break
 
@@ -111,10 +100,9 @@ class Spider:
     def privateSector(self, url: str):
         """Scrape the private sector vacancies."""
         self.driver.get(url)
+        wait_for_selector(self.driver, "[id^='blog-post-'] a")
         log.info(f" {self.Name} vacancy updates page loaded...")
 
-        self.Emma(10)
-
         self.driver.execute_script("""
             const elem = document.querySelector("[id^='blog-post-'] a");
             elem.scrollIntoView({behavior: 'smooth'})
@@ -142,12 +130,12 @@ class Spider:
                 self.close()
 
             self.driver.get(privateSectorURL)
+            wait_for_selector(self.driver, selector)
             self.driver.execute_script("""
                 const elem = document.querySelector("[id^='blog-post-'] a");
                 elem.scrollIntoView({behavior: 'smooth'})
             """)
 
-            self.Emma(10)
             pvtElems: List[WebElement] = self.driver.find_elements(By.CSS_SELECTOR, selector)
 
             if len(pvtElems) > 0:
@@ -158,28 +146,43 @@ class Spider:
                     if text is not None and len(text) > 0:
                         readMore: bool = re.search(r"read more", text, re.IGNORECASE)
                         if not readMore and "https://www.govpage.co.za" in href:
-                            govPageLinks["businesses"][text] = href
+                            self.govPageLinks["businesses"][text] = href
 
-                numOfBusinesses = len(govPageLinks["businesses"].keys())
+                numOfBusinesses = len(self.govPageLinks["businesses"].keys())
 
                 log.info(f"{self.Name} found {numOfBusinesses} vacancy updates page links..")
                 log.info(f"{self.Name}, scrapping vacancy updates page links content...")
 
-                while self.current_business_index < len(govPageLinks["businesses"]):
-                    k = list(govPageLinks["businesses"].keys())[self.current_business_index]
-                    log.info(f'{self.current_business_index + 1}, scrapping {k} data')
-                    blogpost = self.postContent(govPageLinks["businesses"][k])
-                    govPageLinks["blogPosts"].append(blogpost)
+                businesses = list(self.govPageLinks["businesses"].items())
+                pending = self.checkpoint.pending(businesses)
+                if len(pending) < len(businesses):
+                    log.info(f"{self.Name} resuming, {len(businesses) - len(pending)} posts already scraped today")
+
+                try:
+                    for i, (k, url) in enumerate(pending):
+                        log.info(f'{i + 1}, scrapping {k} data')
+                        blogpost = self.postContent(url)
+                        if blogpost is not None:
+                            self.checkpoint.record(url, blogpost)
+                finally:
+                    self.checkpoint.close()
 
-                    self.save_data()
-                    self.current_business_index += 1
-                    self.save_progress()
+                self.govPageLinks["blogPosts"] = self.checkpoint.merge(businesses)
+                self.save_data()
 
             self.driver.close()
             log.info(f"{self.Name} done")
 
     def postContent(self, url: str):
         """Extract content from a blog post."""
+        blogPost = fetch_post(url, require_content=False)
+        if blogPost is not None:
+            # The private sector listing only keeps the post summary
+            blogPost["content"] = []
+            blogPost["iframe"] = ""
+            blogPost["uuid"] = post_id("gov-", blogPost["href"] or url)
+            return blogPost
+
         self.driver.get(url)
 
         WebDriverWait(self.driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".blog-post")))
@@ -207,14 +210,10 @@ class Spider:
             blogPost["title"] = text
             blogPost["href"] = href
             blogPost["postedDate"] = date
-            blogPost["uuid"] = "gov-" + str(uuid.uuid4())
+            blogPost["uuid"] = post_id("gov-", blogPost["href"] or url)
 
             return blogPost
 
-    def Emma(self, t: int):
-        """Delay function."""
-        time.sleep(t)
-
     def Date(self) -> str:
         """Get today's date in YYYY-MM-DD format."""
         return str(datetime.today().strftime('%Y-%m-%d'))
@@ -1,12 +1,9 @@
 import sys
-import os
 import re
-import uuid
-import time
 import logging
-import json
+import queue
+import threading
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -16,36 +13,36 @@ from selenium.common.exceptions import MoveTargetOutOfBoundsException
 # Assuming Links and BlogPost classes are defined somewhere else in your project
 from spiders.types.types import Links, BlogPost
 from pipeline.writer import GovPageFile  # Adjust the import statement
+from pipeline.checkpoint import Checkpoint
+from pipeline.ids import post_id
+from utils.orchestrator import abandoned
+from utils.driver_pool import get_pool, lease_driver
+from utils.readiness import wait_for_selector
+from spiders.common.govpage_http import fetch_post
 
 
 class Spider:
     Name = "govpage-public-sector"
-    progress_file = 'progress.json'
+    window_size = (768, 1024)
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 1, use_http: bool = True):
         self.AllowedDomains = [
             "https://www.govpage.co.za/",
             "https://www.govpage.co.za/latest-govpage-updates"
         ]
-        opt = webdriver.FirefoxOptions()
-        opt.add_argument("--headless")
-        self.driver = webdriver.Firefox(options=opt)
-        self.driver.set_window_size(768, 1024)
+        # Upper bound on browsers fetching posts at once, keep it low to stay polite to govpage.co.za
+        self.max_concurrency = max(1, max_concurrency)
+        # Read posts over plain HTTP and only load them in a browser when they need JavaScript
+        self.use_http = use_http
+        self.driver = lease_driver(window_size=self.window_size)
         self.govPageLinks = Links()
-        self.load_progress()
-
-    def load_progress(self):
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                self.progress = json.load(f)
-        else:
-            self.progress = {"departments_scraped": 0}
-
-    def save_progress(self):
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.progress, f)
+        # Posts already scraped today, so a restarted run only fetches what is missing
+        self.checkpoint = Checkpoint(self.Name)
 
     def save_data(self):
+        if abandoned():
+            log.warning(f"{self.Name} timed out, not writing its posts")
+            return
         GovPageFile(self.govPageLinks, "govpage-public-sector")
 
     
@@ -117,9 +114,9 @@ class Spider:
     def scrape_departments(self, url: str):
         self.driver.get(url)
         log.info(f"{self.Name} vacancy updates page loaded...")
-        self.dynamic_wait(10)
 
         try:
+            wait_for_selector(self.driver, "[id^='blog-post-'] a")
             self.driver.execute_script("document.querySelector('[id^=\"blog-post-\"] a').scrollIntoView({behavior: 'smooth'})")
 
             selector = "[id^='blog-post-'] a"
@@ -140,16 +137,26 @@ class Spider:
                 log.info(f"{self.Name} found {num_of_departments} vacancy updates page links.")
                 log.info(f"{self.Name} scraping vacancy updates page links content...")
 
-                for i, k in enumerate(self.govPageLinks["departments"]):
+                departments = list(self.govPageLinks["departments"].items())
+                pending = self.checkpoint.pending(departments)
+                if len(pending) < len(departments):
+                    log.info(f"{self.Name} resuming, {len(departments) - len(pending)} posts already scraped today")
+
+                drivers = [self.driver] + self.lease_extra_drivers(min(self.max_concurrency, len(pending)) - 1)
+                log.info(f"{self.Name} fetching {len(pending)} posts with {len(drivers)} browser(s)")
+
+                try:
+                    for url, blogpost in self.scrape_posts(pending, drivers):
+                        if blogpost is not None:
+                            self.checkpoint.record(url, blogpost)
+                finally:
+                    self.checkpoint.close()
+                    for driver in drivers[1:]:
+                        driver.quit()
+
+                self.govPageLinks["blogPosts"] = self.checkpoint.merge(departments)
+                self.save_data()
 
-                    url = self.govPageLinks["departments"][k]
-                    log.info(f"{i + 1}, scraping {k} data")
-                    blogpost = self.scrape_post_content(url)
-                    self.govPageLinks["blogPosts"].append(blogpost)
-                    self.progress["departments_scraped"] = i + 1
-                    self.save_data()
-                    self.save_progress()
-                    
 
             self.driver.close()
             log.info(f"{self.Name} done")
@@ -158,34 +165,90 @@ class Spider:
             log.error(f"Error during department scraping: {str(e)}")
             self.close()
 
-    def scrape_post_content(self, url: str):
-        self.driver.get(url)
-        WebDriverWait(self.driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".blog-post")))
-        self.driver.execute_script("document.querySelector('.blog-post').scrollIntoView({behavior: 'smooth'})")
+    def lease_extra_drivers(self, count: int) -> list:
+        """Lease up to `count` more browsers without waiting, other sources may be using the rest of the pool."""
+        drivers = []
+        for _ in range(count):
+            driver = get_pool().lease(self.window_size, timeout=0)
+            if driver is None:
+                break
+            drivers.append(driver)
+        return drivers
+
+    def scrape_posts(self, departments: list, drivers: list):
+        """
+        Fetch department posts with one worker thread per browser.
+
+        (url, post) pairs are yielded in the order of `departments` however the fetches
+        finish; a post that fails to load, or a page without a post, is left out.
+        """
+        todo = queue.Queue()
+        for i, (name, url) in enumerate(departments):
+            todo.put((i, name, url))
+        done = queue.Queue()
+
+        def worker(driver):
+            while True:
+                try:
+                    i, name, url = todo.get_nowait()
+                except queue.Empty:
+                    return
+                log.info(f"{i + 1}, scraping {name} data")
+                try:
+                    done.put((i, (url, self.scrape_post_content(url, driver))))
+                except Exception as e:
+                    log.error(f"Error scraping {name}: {str(e)}")
+                    done.put((i, None))
+
+        for driver in drivers:
+            threading.Thread(target=worker, args=(driver,), daemon=True).start()
+
+        finished = {}
+        next_index = 0
+        for _ in departments:
+            i, result = done.get()
+            finished[i] = result
+            while next_index in finished:
+                result = finished.pop(next_index)
+                next_index += 1
+                if result is not None:
+                    yield result
+
+    def scrape_post_content(self, url: str, driver=None):
+        if self.use_http:
+            blog_post = fetch_post(url)
+            if blog_post is not None:
+                blog_post["uuid"] = post_id("p", blog_post["href"] or url)
+                return blog_post
+
+        driver = driver or self.driver
+        driver.get(url)
+        WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".blog-post")))
+        driver.execute_script("document.querySelector('.blog-post').scrollIntoView({behavior: 'smooth'})")
 
         selector = ".blog-title-link.blog-link"
-        elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        elems = driver.find_elements(By.CSS_SELECTOR, selector)
         if elems:
             elem = elems[0]
             text = elem.text
             href = elem.get_attribute("href")
 
-            date = self.driver.find_element(By.CSS_SELECTOR, ".blog-date > .date-text").text
+            date = driver.find_element(By.CSS_SELECTOR, ".blog-date > .date-text").text
 
             blog_post = BlogPost()
-            blog_post["imgSrc"] = self.driver.execute_script("return location.origin + document.querySelector('*[alt=\"Picture\"]').getAttribute('src')")
+            blog_post["imgSrc"] = driver.execute_script("return location.origin + document.querySelector('*[alt=\"Picture\"]').getAttribute('src')")
             blog_post["title"] = text
             blog_post["href"] = href
             blog_post["postedDate"] = date
-            blog_post["uuid"] = "p" + str(uuid.uuid4())
+            blog_post["uuid"] = post_id("p", blog_post["href"] or url)
             blog_post["content"] = []
 
-            paragraphs = self.driver.find_elements(By.CSS_SELECTOR, ".blog-content > .paragraph")
+            paragraphs = driver.find_elements(By.CSS_SELECTOR, ".blog-content > .paragraph")
             for paragraph in paragraphs:
                 blog_post["content"].append(paragraph.text)
 
             if not blog_post["content"]:
-                src = self.driver.execute_script("""
+                src = driver.execute_script("""
                     return Array.from(document.getElementsByTagName('iframe'))
                                 .filter(f => f.src.includes('drive.google'))
                                 .map(f => f.src)[0];
@@ -193,7 +256,7 @@ class Spider:
                 blog_post["iframe"] = src
 
             return blog_post
-        return "no blog post found"
+        return None
 
     def close(self):
         log.warning(f"{self.Name}, Sorry, No Government Job Posts for today")
@@ -207,10 +270,6 @@ class Spider:
     def get_date() -> str:
         return datetime.now().strftime("%d %B %Y")
 
-    @staticmethod
-    def dynamic_wait(seconds: float):
-        time.sleep(seconds)
-
 
 # Create a custom formatter for log messages
 log_formatter = logging.Formatter("%(asctime)s [%(levelname)s]: %(message)s", datefmt="%d %B %Y %H:%M:%S")
@@ -0,0 +1,72 @@
+import os
+import json
+import shutil
+from datetime import date
+
+from pipeline.compact import compact, expiry_date
+from pipeline.fields import extract_fields
+from pipeline.sanitize import sanitize_file
+
+# Two SA-Youth posts as the Go scraper wrote them: one with "Closing date: 10 October 2024",
+# one with an unknown closing date, posted 11 September 2024
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sa_youth_posts.json")
+
+
+def sanitised_copy(tmp_path):
+    path = str(tmp_path / "private" / "SA-Youth.json")
+    os.makedirs(os.path.dirname(path))
+    shutil.copy(FIXTURE, path)
+    # main.py sanitises the private sources before compacting them
+    sanitize_file(path)
+    return path
+
+
+def test_dates_survive_sanitising(tmp_path):
+    with open(sanitised_copy(tmp_path)) as f:
+        closing, posted = json.load(f)["blogPosts"]
+    assert expiry_date(closing) == date(2024, 10, 10)
+    assert expiry_date(posted) == date(2024, 9, 25)  # posted date plus MAX_AGE
+
+
+def test_archives_expired_sa_youth_post(tmp_path):
+    path = sanitised_copy(tmp_path)
+    archive_dir = str(tmp_path / "archive")
+
+    reclaimed = compact([path], archive_dir=archive_dir, today=date(2024, 10, 1))
+    with open(path) as f:
+        live = json.load(f)["blogPosts"]
+    assert len(live) == 1 and expiry_date(live[0]) == date(2024, 10, 10)
+    assert reclaimed > 0
+    with open(os.path.join(archive_dir, "2024-09", "SA-Youth.jsonl")) as f:
+        archived = [json.loads(line) for line in f]
+    assert [entry["expired"] for entry in archived] == ["2024-09-25"]
+
+    compact([path], archive_dir=archive_dir, today=date(2024, 10, 11))
+    with open(path) as f:
+        assert json.load(f)["blogPosts"] == []
+    assert os.path.exists(os.path.join(archive_dir, "2024-10", "SA-Youth.jsonl"))
+
+
+def test_multi_vacancy_post_stays_until_last_closing_date(tmp_path):
+    # Shaped like the National Gambling Board post on govpage, two vacancies closing a week apart
+    post = {
+        "title": "NATIONAL GAMBLING BOARD OF SOUTH AFRICA VACANCIES",
+        "content": [
+            "SENIOR MANAGER: LEGAL SERVICES",
+            "CLOSING DATE for all applications: 07 OCTOBER 2024",
+            "MANAGER: COMPLIANCE",
+            "Closing date: 14 October 2024",
+        ],
+        "uuid": "ngb",
+    }
+    assert expiry_date(post) == date(2024, 10, 14)
+    post.update(extract_fields("\n".join(post["content"]), "govpage-public-sector"))
+    assert post["closingDate"] == "2024-10-14"
+    assert expiry_date(post) == date(2024, 10, 14)
+
+    path = str(tmp_path / "govpage-public-sector.json")
+    with open(path, "w") as f:
+        json.dump({"blogPosts": [post]}, f)
+    assert compact([path], archive_dir=str(tmp_path / "archive"), today=date(2024, 10, 8)) == 0
+    with open(path) as f:
+        assert len(json.load(f)["blogPosts"]) == 1
@@ -0,0 +1,34 @@
+from datetime import date
+
+from pipeline.fields import extract_fields
+from utils.dates import DateParser
+
+# From the Eskom post in database/public/govpage-public-sector.json, which writes its dates
+# month-first next to a day-first reference number
+ESKOM = """ESKOM VACANCIES
+Closing Date : 10/14/2024
+Closing Date : 10/11/2024
+Reference Number : Gx Arn NN 29/09/2024
+Closing Date : 10/7/2024
+Closing Date : 10/14/2024"""
+
+
+def test_eskom_dates_read_month_first():
+    parser = DateParser()
+    source = "govpage-public-sector"
+    assert parser.parse("10/7/2024", source, context=ESKOM) == date(2024, 10, 7)
+    assert parser.parse("10/11/2024", source, context=ESKOM) == date(2024, 10, 11)
+    assert parser.parse("10/14/2024", source, context=ESKOM) == date(2024, 10, 14)
+
+    post = "Start Date : 10/14/2024\nClosing Date : 10/7/2024"
+    assert extract_fields(post, source)["closingDate"] == "2024-10-07"
+
+
+def test_us_date_does_not_flip_other_departments():
+    parser = DateParser()
+    source = "govpage-public-sector"
+    assert parser.parse("10/14/2024", source, context="Closing date: 10/14/2024") == date(2024, 10, 14)
+    # Another department's post in the same file, with nothing month-first in it
+    other = "Closing date: 05/10/2024\nReference: 30/2024"
+    assert parser.parse("05/10/2024", source, context=other) == date(2024, 10, 5)
+    assert parser.parse("05/10/2024", source) == date(2024, 10, 5)
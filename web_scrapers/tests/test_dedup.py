@@ -0,0 +1,38 @@
+import json
+
+from pipeline.dedup import deduplicate
+
+BODY = ("The Department of Health invites applications for a Senior Administration Officer in the "
+        "Human Resources directorate. Duties include managing leave records, processing appointments "
+        "and transfers, compiling monthly reports and supervising two administration clerks. "
+        "Requirements are a National Diploma in Public Administration and three years of experience.")
+
+
+def write_source(path, post):
+    with open(path, "w") as f:
+        json.dump({"blogPosts": [post]}, f)
+    return str(path)
+
+
+def test_merges_copies_that_write_the_closing_date_differently(tmp_path):
+    govpage = write_source(tmp_path / "govpage-provincial.json", {
+        "title": "SENIOR ADMINISTRATION OFFICER",
+        "content": [BODY, "Reference No: HR/2024/17", "Closing Date 2024-10-10"],
+        "uuid": "a",
+    })
+    department = write_source(tmp_path / "govpage-national.json", {
+        "title": "Senior Administration Officer",
+        "content": [BODY, "Reference No: HR/2024/17", "CLOSING DATE : 10 October 2024 at 12:00"],
+        "uuid": "b",
+    })
+    assert sum(deduplicate([govpage, department], pdf_posts_path=None).values()) == 1
+
+
+def test_keeps_posts_with_different_closing_dates(tmp_path):
+    first = write_source(tmp_path / "govpage-provincial.json", {
+        "title": "SENIOR ADMINISTRATION OFFICER", "content": [BODY, "Closing Date: 10 October 2024"], "uuid": "a",
+    })
+    second = write_source(tmp_path / "govpage-national.json", {
+        "title": "SENIOR ADMINISTRATION OFFICER", "content": [BODY, "Closing Date: 31 October 2024"], "uuid": "b",
+    })
+    assert deduplicate([first, second], pdf_posts_path=None) == {}
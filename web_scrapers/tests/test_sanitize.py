@@ -0,0 +1,19 @@
+import os
+import json
+
+from pipeline.sanitize import sanitize_html, sanitize_post
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sa_youth_posts.json")
+
+
+def test_sanitising_twice_changes_nothing():
+    with open(FIXTURE) as f:
+        posts = json.load(f)["blogPosts"]
+    for post in posts:
+        once = sanitize_post(post)
+        assert sanitize_post(once) == once
+
+
+def test_unwraps_every_level_of_single_child_divs():
+    markup = "<section><div><div><p>Closing date</p></div><div><span> </span></div></div></section>"
+    assert sanitize_html(markup) == "<p>Closing date</p>"
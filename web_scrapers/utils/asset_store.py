@@ -0,0 +1,82 @@
+import os
+import json
+from datetime import datetime
+
+from pipeline.writer import atomic_write_json
+from utils.download_cache import get_download_cache
+from utils.file_hash import get_hash_index
+
+# Hex digits of the SHA-256 kept in file names, plenty to avoid collisions between a few thousand assets
+NAME_DIGITS = 16
+
+
+class AssetStore:
+    """
+    A directory of files named after their content, e.g. `3f9a0c2d41b7e8aa.png`.
+
+    A file keeps its name for as long as its bytes do not change, so its URL can be cached
+    indefinitely. An index in the directory remembers each stored file's hash and when it was
+    added; hashing goes through the shared hash index, so unchanged files are not read again.
+    """
+
+    def __init__(self, directory, url_prefix, extensions, index_name='.asset_index.json'):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.extensions = tuple(extensions)
+        self.index_path = os.path.join(directory, index_name)
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.files = json.load(f)
+        else:
+            self.files = {}
+
+    def ingest(self, max_workers=None):
+        """
+        Moves every new file in the directory to its content-addressed name and drops duplicates.
+
+        Download cache entries pointing at a moved file are updated, so the bots keep sending
+        conditional requests for it instead of downloading it again.
+
+        Args:
+            max_workers (int): Hash files on this many threads. Defaults to hashing one at a time.
+
+        Returns:
+            tuple: (files added, duplicates deleted)
+        """
+        added = duplicates = 0
+        hash_index = get_hash_index()
+        names = sorted(f for f in os.listdir(self.directory) if f.lower().endswith(self.extensions))
+        hashes = hash_index.hash_many([os.path.join(self.directory, name) for name in names], max_workers)
+        stored = {}
+        for name in names:
+            path = os.path.join(self.directory, name)
+            sha256 = hashes[path]
+            target = f'{sha256[:NAME_DIGITS]}{os.path.splitext(name)[1].lower()}'
+            target_path = os.path.join(self.directory, target)
+
+            if name != target:
+                if os.path.exists(target_path):
+                    os.remove(path)
+                    duplicates += 1
+                else:
+                    os.replace(path, target_path)
+                    hash_index.move(path, target_path)
+                    added += 1
+                get_download_cache().relocate(path, target_path)
+
+            if target not in stored:
+                previous = self.files.get(target, {})
+                stored[target] = {
+                    'sha256': sha256,
+                    'added': previous.get('added') or datetime.now().strftime('%Y-%m-%d'),
+                }
+
+        self.files = stored
+        atomic_write_json(self.files, self.index_path)
+        hash_index.save()
+        return added, duplicates
+
+    def urls(self):
+        """URLs of the stored files, oldest first so new assets are appended to the list."""
+        names = sorted(self.files, key=lambda name: (self.files[name]['added'], name))
+        return [f'{self.url_prefix}/{name}' for name in names]
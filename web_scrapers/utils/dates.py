@@ -0,0 +1,169 @@
+import re
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+# Every closing date style seen on the scraped sites. Day-first comes before month-first, so an
+# ambiguous "05/10/2024" is 5 October unless the text around it writes its dates month-first
+MONTH_FIRST = "%m/%d/%Y"
+FORMATS = (
+    "%Y-%m-%d",  # 2024-10-10
+    "%d/%m/%Y",  # 30/9/2024
+    MONTH_FIRST,  # 10/14/2024
+    "%d-%m-%Y",  # 31-07-2024
+    "%d.%m.%Y",  # 31.07.2024
+    "%Y/%m/%d",  # 2024/10/10
+    "%d %B %Y",  # 31 July 2024, also "31-Jul-2024" and "31 Jul, 2024" once normalised
+    "%d %b %Y",  # 31 Jul 2024
+    "%B %d %Y",  # July 31, 2024
+    "%b %d %Y",  # Jul 31, 2024
+)
+# Cheap check that a string can be a date at all, table cells mostly are not
+YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+# Numeric day/month dates, ambiguous when both of the first two numbers could be the month
+DAY_MONTH = re.compile(r"^(\d{1,2})[/.-](\d{1,2})[/.-]\d{4}$")
+# The same dates inside a longer text, see month_first
+NUMERIC_DATE = re.compile(r"(?<![\d/])(\d{1,2})/(\d{1,2})/\d{4}(?!\d)")
+ORDINAL = re.compile(r"(?<=\d)(?:st|nd|rd|th)\b", re.IGNORECASE)
+# Parsed strings kept in memory, the cache is emptied when it grows past this
+MAX_CACHED = 10000
+
+
+def ambiguous(text: str) -> bool:
+    """ "05/10/2024" could be 5 October or 10 May, "30/9/2024" and "10/14/2024" can only be read one way."""
+    match = DAY_MONTH.match(text)
+    return bool(match) and match.group(1) != match.group(2) and \
+        int(match.group(1)) <= 12 and int(match.group(2)) <= 12
+
+
+def month_first(context: str) -> bool:
+    """
+    Whether `context`, e.g. the text of one post, writes its dates month-first. Only dates that
+    can be read one way count: "10/14/2024" is a vote for month-first, "29/09/2024" one for
+    day-first, and the majority wins, so a day-first reference number such as "Gx Arn NN 29/09/2024"
+    in a post of month-first closing dates does not change how they are read.
+    """
+    votes = 0
+    for match in NUMERIC_DATE.finditer(context or ""):
+        first, second = int(match.group(1)), int(match.group(2))
+        if first <= 12 < second:
+            votes += 1
+        elif second <= 12 < first:
+            votes -= 1
+    return votes > 0
+
+
+def normalise(text: str) -> str:
+    """ "30th Sept, 2024" -> "30 Sep 2024", "10-Oct-2024" -> "10 Oct 2024"; numeric dates are left alone."""
+    text = " ".join((text or "").replace(",", " ").split())
+    if re.search(r"[A-Za-z]", text):
+        text = ORDINAL.sub("", text).replace("-", " ")
+        text = re.sub(r"\bSept\b", "Sep", text, flags=re.IGNORECASE)
+        text = " ".join(text.split())
+    return text
+
+
+class DateParser:
+    """
+    Parses dates in any of FORMATS and remembers, per source, which format worked.
+
+    A source nearly always writes its dates one way, so its last winning format is tried
+    first and usually the only strptime call needed. The learned format only makes parsing
+    faster and never changes a result. A date that could be day-first or month-first is not
+    learned from either: it is read the way the other dates of its own post are written, see
+    month_first, and day-first when they don't tell. So Eskom's "10/7/2024" next to its
+    "10/14/2024" is 7 October, while one US-style date in a file that holds many departments'
+    posts cannot change how the other departments' dates are read.
+
+    Results, including strings that are not dates, are memoised, so a value seen before
+    (the same closing date on every row of a table) costs a dict lookup.
+    """
+
+    def __init__(self, formats=FORMATS):
+        self.formats = tuple(formats)
+        self.learned = {}  # source -> format of its last parsed date
+        self._cache = {}  # (text, format tried first) -> (date or None, winning format)
+        self._lock = threading.Lock()
+
+    def _order(self, first):
+        if first is None:
+            return self.formats
+        return (first,) + tuple(fmt for fmt in self.formats if fmt != first)
+
+    def parse(self, text: str, source: str = None, context: str = None) -> Optional[date]:
+        """
+        Args:
+            text (str): The date as written, e.g. "30/9/2024", "2024-10-10" or "31 Jul 2024".
+            source (str): Name of the site the date comes from, e.g. the bot name.
+            context (str): The post or text block the date was found in, only read when
+                `text` is ambiguous.
+
+        Returns:
+            date: The date, or None when `text` is not a date in any known format.
+        """
+        text = normalise(text)
+        if not YEAR.search(text):
+            return None
+        is_ambiguous = ambiguous(text)
+        if is_ambiguous:
+            first = MONTH_FIRST if month_first(context) else None
+        else:
+            first = self.learned.get(source)
+        key = (text, first)
+        found = self._cache.get(key)
+        if found is None:
+            found = (None, first)
+            for fmt in self._order(first):
+                try:
+                    found = (datetime.strptime(text, fmt).date(), fmt)
+                    break
+                except ValueError:
+                    continue
+            with self._lock:
+                if len(self._cache) >= MAX_CACHED:
+                    self._cache.clear()
+                self._cache[key] = found
+        parsed, fmt = found
+        if parsed is not None and source is not None and not is_ambiguous:
+            self.learned[source] = fmt
+        return parsed
+
+
+_parser: Optional[DateParser] = None
+_parser_lock = threading.Lock()
+
+
+def get_date_parser() -> DateParser:
+    """Returns the date parser shared by the bots and pipeline stages."""
+    global _parser
+    with _parser_lock:
+        if _parser is None:
+            _parser = DateParser()
+        return _parser
+
+
+def parse_date(text: str, source: str = None, context: str = None) -> Optional[date]:
+    """Parses `text` with the shared parser, see DateParser.parse."""
+    return get_date_parser().parse(text, source, context)
+
+
+def is_open(closing: date, today: date = None, window: timedelta = None) -> bool:
+    """
+    Whether applications are still open on `today` (the current date by default).
+
+    Args:
+        closing (date): The closing date, applications are accepted up to and including it.
+        today (date): Defaults to today.
+        window (timedelta): Only count vacancies closing within this time from today, e.g.
+            timedelta(days=14). Defaults to no limit.
+
+    Returns:
+        bool
+    """
+    if closing is None:
+        return False
+    if isinstance(closing, datetime):
+        closing = closing.date()
+    today = today or date.today()
+    remaining = closing - today
+    return remaining >= timedelta(0) and (window is None or remaining <= window)
@@ -0,0 +1,133 @@
+import os
+import json
+import logging
+import threading
+from typing import Optional
+
+from pipeline.writer import atomic_write_json
+from utils.downloader import stream_download
+
+# Outcomes of DownloadCache.fetch
+NOT_MODIFIED = "not-modified"
+DOWNLOADED = "downloaded"
+DUPLICATE = "duplicate"
+FAILED = "failed"
+
+
+class DownloadCache:
+    """
+    Remembers the ETag, Last-Modified and SHA-256 of every file the bots download.
+
+    `fetch` sends If-None-Match / If-Modified-Since for URLs it has seen before, so an
+    unchanged file costs a 304 instead of a download, while a file that changed under the
+    same name is refreshed: the previous version is deleted once no other URL points at it, so
+    only the current bytes are stored and rendered. Content already stored under another name is
+    not written twice.
+    """
+
+    def __init__(self, index_path='database/download_cache.json'):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def _conditional_headers(self, url: str) -> dict:
+        entry = self.entries.get(url)
+        if not entry or not os.path.exists(entry["path"]):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def _path_with_hash(self, sha256: str) -> Optional[str]:
+        for entry in self.entries.values():
+            if entry.get("sha256") == sha256 and os.path.exists(entry["path"]):
+                return entry["path"]
+        return None
+
+    def _remove_unreferenced(self, path: str):
+        """Deletes a file the cache no longer points at, e.g. the old version of a changed PDF."""
+        if any(os.path.normpath(entry["path"]) == os.path.normpath(path) for entry in self.entries.values()):
+            return
+        if os.path.exists(path):
+            os.remove(path)
+            logging.info(f"Removed '{path}', replaced by a newer version.")
+
+    def fetch(self, url: str, path: str) -> str:
+        """
+        Downloads `url` to `path` unless the server says the cached copy is still current.
+
+        Args:
+            url (str): The file URL.
+            path (str): Where to store the file.
+
+        Returns:
+            str: NOT_MODIFIED, DOWNLOADED, DUPLICATE (same bytes already stored elsewhere) or FAILED.
+        """
+        file_name = os.path.basename(path)
+        with self._lock:
+            headers = self._conditional_headers(url)
+        try:
+            result = stream_download(url, path, headers=headers)
+        except Exception as e:
+            logging.error(f"Failed to download '{file_name}': {e}")
+            return FAILED
+
+        if result["status"] == 304:
+            logging.info(f"File '{file_name}' not modified since last download.")
+            return NOT_MODIFIED
+        if result["status"] != 200:
+            logging.error(f"Failed to download file '{file_name}'. Status code: {result['status']}")
+            return FAILED
+
+        with self._lock:
+            existing = self._path_with_hash(result["sha256"])
+            if existing is not None and existing != path:
+                os.remove(path)
+                logging.info(f"File '{file_name}' is already stored as '{existing}'.")
+                path, status = existing, DUPLICATE
+            else:
+                logging.info(f"Downloaded {file_name}")
+                status = DOWNLOADED
+            previous = self.entries.get(url)
+            self.entries[url] = {
+                "path": path,
+                "etag": result["etag"],
+                "lastModified": result["lastModified"],
+                "sha256": result["sha256"],
+                "size": result["size"],
+            }
+            if previous and previous.get("sha256") != result["sha256"]:
+                self._remove_unreferenced(previous["path"])
+            atomic_write_json(self.entries, self.index_path)
+        return status
+
+    def relocate(self, old_path: str, new_path: str):
+        """Points entries for a file that was moved or deduplicated at its new path."""
+        with self._lock:
+            moved = False
+            for entry in self.entries.values():
+                if os.path.normpath(entry["path"]) == os.path.normpath(old_path):
+                    entry["path"] = new_path
+                    moved = True
+            if moved:
+                atomic_write_json(self.entries, self.index_path)
+
+
+_cache: Optional[DownloadCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_download_cache() -> DownloadCache:
+    """Returns the download cache shared by all bots."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DownloadCache()
+        return _cache
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+
+from utils.http_session import get_session
+
+# Largest file the bots will accept, vacancy circulars are a few MB at most
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed."""
+
+
+# One lock per target path, fetches of the same file share its ".part" file
+_path_locks = {}
+_path_locks_lock = threading.Lock()
+
+
+def _path_lock(path: str) -> threading.Lock:
+    with _path_locks_lock:
+        return _path_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def _resume_validator(url: str, part_path: str) -> str:
+    """
+    The If-Range value for resuming `part_path`: the ETag or Last-Modified of the response
+    it was started from, saved next to it. "" when the partial file cannot be trusted (no
+    record, another URL, or only a weak ETag), it is then discarded.
+    """
+    try:
+        with open(part_path + ".json") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    if saved.get("url") == url:
+        etag = saved.get("etag", "")
+        if etag and not etag.startswith("W/"):
+            return etag
+        if saved.get("lastModified"):
+            return saved["lastModified"]
+    _remove_partial(part_path)
+    return ""
+
+
+def _remove_partial(part_path: str):
+    for stale in (part_path, part_path + ".json"):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def stream_download(url: str, path: str, headers: dict = None,
+                    max_bytes: int = MAX_DOWNLOAD_BYTES,
+                    timeout: tuple = (10, 60), total_timeout: float = 300,
+                    attempts: int = 3) -> dict:
+    """
+    Streams `url` to `path` in chunks, hashing it as it arrives, so memory use stays flat.
+
+    Data goes to `path + ".part"`, which is renamed over `path` only once the whole body
+    is on disk. If the connection drops, the next attempt (or the next run) asks for the
+    rest with an HTTP Range request. The ETag or Last-Modified of the response the partial
+    file came from is saved in `path + ".part.json"` and sent as If-Range, so a file that
+    changed on the server is downloaded again from the start rather than spliced. Fetches of
+    the same `path` run one at a time.
+
+    Args:
+        url (str): The file URL.
+        path (str): Where to store the file.
+        headers (dict): Extra request headers, e.g. If-None-Match.
+        max_bytes (int): Abort downloads larger than this. Defaults to MAX_DOWNLOAD_BYTES.
+        timeout (tuple): Connect and read timeouts in seconds. Defaults to (10, 60).
+        total_timeout (float): Abort if the whole download takes longer than this. Defaults to 300.
+        attempts (int): Connection attempts before giving up. Defaults to 3.
+
+    Returns:
+        dict: "status" (HTTP status, 200 once stored, 304 if not modified), "sha256", "size",
+        "etag" and "lastModified". Only "status" is set for non-200 responses.
+
+    Raises:
+        DownloadError: If the file is too large, too slow, or every attempt failed.
+    """
+    part_path = path + ".part"
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with _path_lock(path):
+        return _stream_download(url, path, part_path, headers, max_bytes, timeout, total_timeout, attempts)
+
+
+def _stream_download(url, path, part_path, headers, max_bytes, timeout, total_timeout, attempts) -> dict:
+    started = time.monotonic()
+    session = get_session()
+
+    for attempt in range(1, attempts + 1):
+        request_headers = dict(headers or {})
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = _resume_validator(url, part_path) if offset else ""
+        if validator:
+            request_headers["Range"] = f"bytes={offset}-"
+            request_headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        try:
+            with session.get(url, headers=request_headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 416:
+                    # The partial file does not fit the current file any more, start over
+                    _remove_partial(part_path)
+                    continue
+                if response.status_code not in (200, 206):
+                    return {"status": response.status_code}
+
+                if response.status_code == 200:
+                    # No Range header, or the file changed since the partial download (If-Range
+                    # failed) or the server ignores ranges: start from scratch
+                    offset = 0
+                    with open(part_path + ".json", "w") as f:
+                        json.dump({"url": url, "etag": response.headers.get("ETag", ""),
+                                   "lastModified": response.headers.get("Last-Modified", "")}, f)
+                length = response.headers.get("Content-Length")
+                if length is not None and offset + int(length) > max_bytes:
+                    raise DownloadError(f"{url} is {offset + int(length)} bytes, over the {max_bytes} byte limit")
+
+                hasher = hashlib.sha256()
+                if offset:
+                    with open(part_path, "rb") as f:
+                        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                            hasher.update(chunk)
+
+                size = offset
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise DownloadError(f"{url} exceeded the {max_bytes} byte limit")
+                        if time.monotonic() - started > total_timeout:
+                            raise DownloadError(f"{url} took longer than {total_timeout}s")
+                        hasher.update(chunk)
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                os.chmod(part_path, 0o644)
+                os.replace(part_path, path)
+                _remove_partial(part_path)
+                return {
+                    "status": 200,
+                    "sha256": hasher.hexdigest(),
+                    "size": size,
+                    "etag": response.headers.get("ETag", ""),
+                    "lastModified": response.headers.get("Last-Modified", ""),
+                }
+        except DownloadError:
+            _remove_partial(part_path)
+            raise
+        except requests.RequestException as e:
+            # Keep the partial file so the next attempt can resume it
+            logging.warning(f"Download of {url} interrupted (attempt {attempt} of {attempts}): {e}")
+
+    raise DownloadError(f"Could not download {url} after {attempts} attempts")
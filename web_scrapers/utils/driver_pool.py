@@ -0,0 +1,282 @@
+import os
+import logging
+import threading
+from typing import Optional, Tuple
+from selenium import webdriver
+
+
+# Runs in Firefox's chrome context, deletes the cookies and DOM storage of every site
+CLEAR_SITE_DATA = """
+const done = arguments[arguments.length - 1];
+const flags = Ci.nsIClearDataService.CLEAR_COOKIES | Ci.nsIClearDataService.CLEAR_DOM_STORAGES;
+Services.clearData.deleteData(flags, () => done(true));
+"""
+
+
+class _Slot:
+    """A warm Firefox instance owned by the pool, with the number of pages it has loaded."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class PooledDriver:
+    """
+    A leased Firefox session.
+
+    Behaves like the `webdriver.Firefox` it wraps, so spiders and bots use it unchanged, but
+    `close()` on the last window and `quit()` hand the browser back to the pool instead of
+    shutting it down. Closing one of several open tabs still just closes that tab.
+    """
+
+    def __init__(self, pool: "DriverPool", slot: _Slot):
+        self._pool = pool
+        self._slot = slot
+        self._owner = threading.get_ident()
+
+    def _live_slot(self) -> _Slot:
+        slot = self._slot
+        if slot is None:
+            raise RuntimeError("Driver has already been returned to the pool")
+        return slot
+
+    def __getattr__(self, name):
+        return getattr(self._live_slot().driver, name)
+
+    def get(self, url: str):
+        slot = self._live_slot()
+        slot.pages += 1
+        slot.driver.get(url)
+
+    def close(self):
+        if self._slot is None:
+            return
+        if len(self._slot.driver.window_handles) > 1:
+            self._slot.driver.close()
+        else:
+            self.quit()
+
+    def quit(self):
+        slot = self._pool._detach(self)
+        if slot is not None:
+            self._pool.release(slot)
+
+
+class DriverPool:
+    """
+    Keeps a fixed number of headless Firefox instances alive and leases them to spiders and bots.
+
+    Browsers are started lazily up to `size` (or all at once with `start()`), reset between
+    leases (cookies and local and session storage of every site, extra tabs) and replaced once
+    they have loaded `pages_per_driver` pages to keep memory growth in check. A browser that
+    cannot be fully reset is quit rather than handed to the next lease.
+    """
+
+    def __init__(self, size: int = 3, pages_per_driver: int = 50,
+                 download_directory: str = 'database/pdfs', headless: bool = True):
+        self.size = max(1, size)
+        self.pages_per_driver = pages_per_driver
+        # Firefox needs an absolute path for its download directory
+        self.download_directory = os.path.abspath(download_directory)
+        self.headless = headless
+        self._idle = []
+        self._leased = set()
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _new_driver(self):
+        opt = webdriver.FirefoxOptions()
+        if self.headless:
+            opt.add_argument("--headless")
+        # Save PDFs straight to the download directory, as the Rainbow bot expects
+        opt.set_preference("browser.download.folderList", 2)
+        opt.set_preference("browser.download.manager.showWhenStarting", False)
+        opt.set_preference("browser.download.dir", self.download_directory)
+        opt.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/pdf")
+        opt.set_preference("pdfjs.disabled", True)
+        # Newer Firefox versions only allow the chrome context _reset uses with this set
+        os.environ.setdefault("MOZ_REMOTE_ALLOW_SYSTEM_ACCESS", "1")
+        logging.info("Starting pooled Firefox instance")
+        return webdriver.Firefox(options=opt)
+
+    def start(self):
+        """Starts every browser up front so no source pays the cold-start cost."""
+        with self._cond:
+            missing = self.size - self._created
+            self._created += missing
+        for _ in range(missing):
+            slot = _Slot(self._new_driver())
+            with self._cond:
+                self._idle.append(slot)
+                self._cond.notify()
+
+    def lease(self, window_size: Tuple[int, int] = (1000, 755),
+              timeout: Optional[float] = None) -> Optional[PooledDriver]:
+        """
+        Leases a browser, starting one if the pool is not yet full, otherwise waiting for one.
+
+        Args:
+            window_size (tuple): Width and height to set on the leased window.
+            timeout (float): Seconds to wait for a free browser. Waits forever when None.
+
+        Returns:
+            PooledDriver: The leased browser, or None if none became free within `timeout`.
+
+        Raises:
+            RuntimeError: If the pool is shut down, also while waiting.
+        """
+        with self._cond:
+            slot = None
+            while slot is None:
+                if self._closed:
+                    raise RuntimeError("Driver pool has been shut down")
+                if self._idle:
+                    slot = self._idle.pop()
+                elif self._created < self.size:
+                    self._created += 1
+                    break
+                elif not self._cond.wait(timeout):
+                    return None
+        if slot is None:
+            try:
+                slot = _Slot(self._new_driver())
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        slot.driver.set_window_size(*window_size)
+        leased = PooledDriver(self, slot)
+        with self._cond:
+            self._leased.add(leased)
+        return leased
+
+    def _detach(self, leased: PooledDriver) -> Optional[_Slot]:
+        """Ends a lease, returns its browser slot, or None if the lease had already ended."""
+        with self._cond:
+            slot, leased._slot = leased._slot, None
+            self._leased.discard(leased)
+            return slot
+
+    def release(self, slot: _Slot):
+        """Resets a browser and returns it to the pool, recycling it if it is worn out."""
+        if self._closed or slot.pages >= self.pages_per_driver or not self._reset(slot.driver):
+            if slot.pages >= self.pages_per_driver:
+                logging.info(f"Recycling Firefox instance after {slot.pages} pages")
+            self._discard(slot)
+            return
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify()
+
+    def _discard(self, slot: _Slot):
+        try:
+            slot.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting Firefox instance: {e}")
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Clears cookies and storage for every site, not just the current document's. Without
+            # the chrome context only the current site could be cleared, so the browser is replaced
+            with driver.context(driver.CONTEXT_CHROME):
+                driver.execute_async_script(CLEAR_SITE_DATA)
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logging.warning(f"Could not reset Firefox instance, replacing it: {e}")
+            return False
+
+    def reclaim(self):
+        """Returns every browser still leased by the calling thread, e.g. after a source crashed."""
+        owner = threading.get_ident()
+        with self._cond:
+            leases = [d for d in self._leased if d._owner == owner]
+        for leased in leases:
+            leased.quit()
+
+    def shutdown(self):
+        """
+        Quits every browser and refuses further leases. Browsers still leased, e.g. by a
+        source that timed out and was abandoned, are quit too, so their Firefox processes do
+        not outlive the run and the abandoned source fails on its next browser call.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            leased = list(self._leased)
+            self._cond.notify_all()
+        for driver in leased:
+            slot = self._detach(driver)
+            if slot is not None:
+                logging.warning("Quitting a Firefox instance that is still leased")
+                idle.append(slot)
+        for slot in idle:
+            self._discard(slot)
+
+
+# Seconds lease_driver waits for a free browser, a source holding one forever must not block the rest
+LEASE_TIMEOUT = 300
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(**kwargs) -> DriverPool:
+    """Replaces the shared pool with one built from `kwargs` (see DriverPool)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = DriverPool(**kwargs)
+        return _pool
+
+
+def get_pool() -> DriverPool:
+    """Returns the shared pool, creating a default one on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
+
+
+def lease_driver(window_size: Tuple[int, int] = (1000, 755), timeout: float = LEASE_TIMEOUT) -> PooledDriver:
+    """
+    Leases a browser from the shared pool.
+
+    Raises:
+        RuntimeError: If no browser became free within `timeout` seconds.
+    """
+    driver = get_pool().lease(window_size, timeout=timeout)
+    if driver is None:
+        raise RuntimeError(f"No browser became free within {timeout}s")
+    return driver
+
+
+def reclaim_leases():
+    """Returns every browser the calling thread still holds to the shared pool."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.reclaim()
+
+
+def shutdown_pool():
+    """Quits every browser in the shared pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
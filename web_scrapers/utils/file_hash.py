@@ -0,0 +1,131 @@
+import os
+import json
+import mmap
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from pipeline.writer import atomic_write_json
+
+# Read size for buffered hashing, large reads keep the number of system calls low
+BUFFER_SIZE = 1024 * 1024
+# Files at least this big are hashed through mmap instead of read()
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+def hash_file(filepath: str) -> str:
+    """
+    Computes the SHA-256 of a file with large buffered reads, or mmap for big files.
+
+    Args:
+        filepath (str): The path to the file to be hashed.
+
+    Returns:
+        str: The hexadecimal hash of the file.
+    """
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            while chunk := f.read(BUFFER_SIZE):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class HashIndex:
+    """
+    On-disk cache of file hashes keyed by path, invalidated by size and modification time.
+
+    Files whose size and mtime match the index are not read at all, so repeated runs only
+    hash files that were added or changed since the last one.
+    """
+
+    def __init__(self, index_path='database/hash_index.json'):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._dirty = False
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def hash(self, path: str) -> str:
+        """Returns the SHA-256 of `path`, reading the file only if it changed since it was last hashed."""
+        key = os.path.normpath(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                return entry['sha256']
+        sha256 = hash_file(path)
+        with self._lock:
+            self.entries[key] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': sha256}
+            self._dirty = True
+        return sha256
+
+    def hash_many(self, paths: list, max_workers: int = None) -> dict:
+        """
+        Hashes several files, in parallel when `max_workers` is more than one.
+
+        hashlib releases the GIL while it hashes, so threads are enough to keep several
+        disks or cores busy.
+
+        Returns:
+            dict: path -> SHA-256
+        """
+        if not max_workers or max_workers <= 1:
+            return {path: self.hash(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(paths, executor.map(self.hash, paths)))
+
+    def duplicates(self, paths: list, max_workers: int = None) -> dict:
+        """
+        Groups files with identical content.
+
+        Returns:
+            dict: path of the first file (in `paths` order) -> list of paths with the same content
+        """
+        first = {}
+        groups = {}
+        for path, sha256 in self.hash_many(paths, max_workers).items():
+            if sha256 in first:
+                groups.setdefault(first[sha256], []).append(path)
+            else:
+                first[sha256] = path
+        return groups
+
+    def move(self, old_path: str, new_path: str):
+        """Records that a file was renamed, so it is not hashed again under its new name."""
+        with self._lock:
+            entry = self.entries.pop(os.path.normpath(old_path), None)
+            if entry is not None:
+                self.entries[os.path.normpath(new_path)] = entry
+                self._dirty = True
+
+    def save(self):
+        """Writes the index to disk, dropping entries for files that no longer exist."""
+        with self._lock:
+            for key in [key for key in self.entries if not os.path.exists(key)]:
+                del self.entries[key]
+                self._dirty = True
+            if self._dirty:
+                atomic_write_json(self.entries, self.index_path, indent=None)
+                self._dirty = False
+
+
+_index: Optional[HashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_hash_index() -> HashIndex:
+    """Returns the hash index shared by the utils scripts."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = HashIndex()
+        return _index
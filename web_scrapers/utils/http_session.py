@@ -0,0 +1,37 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Sites such as govpage.co.za turn away the default python-requests user agent
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Returns the shared keep-alive session used for plain HTTP fetches.
+
+    The session keeps up to `pool_size` connections per host open and retries
+    connection errors and 502/503/504 responses with backoff.
+
+    Args:
+        pool_size (int): Connections kept open per host, only used when the session is first created.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                          allowed_methods=["GET", "HEAD"])
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
@@ -0,0 +1,121 @@
+import os
+import numpy as np
+from PIL import Image
+
+# Side of the grey thumbnail the difference hash is computed from, giving HASH_SIZE**2 bits
+HASH_SIZE = 8
+# Icons whose hashes differ in at most this many of the 64 bits are treated as the same picture
+MAX_DISTANCE = 6
+# Smallest side in pixels an icon needs to look sharp on the job board
+MIN_ADEQUATE_SIZE = 64
+
+
+def load_thumbnail(path):
+    """Returns the icon as a (HASH_SIZE, HASH_SIZE + 1) grey array, with transparency flattened onto white."""
+    with Image.open(path) as image:
+        if image.format == 'ICO':
+            # Pick the largest picture in the icon file
+            image.size = max(image.info.get('sizes', {image.size}))
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        grey = Image.alpha_composite(background, image).convert('L')
+        return np.asarray(grey.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS), dtype=np.int16)
+
+
+def difference_hashes(thumbnails):
+    """
+    Computes the difference hash of many thumbnails at once.
+
+    Args:
+        thumbnails (np.ndarray): (N, HASH_SIZE, HASH_SIZE + 1) grey values.
+
+    Returns:
+        np.ndarray: (N, HASH_SIZE**2 / 8) packed hash bytes, one row per icon.
+    """
+    bits = thumbnails[:, :, 1:] > thumbnails[:, :, :-1]
+    return np.packbits(bits.reshape(len(thumbnails), -1), axis=1)
+
+
+def hamming_distances(hashes):
+    """(N, N) matrix of the number of differing bits between every pair of packed hashes."""
+    return np.unpackbits(hashes[:, None, :] ^ hashes[None, :, :], axis=2).sum(axis=2)
+
+
+def group_similar(paths, max_distance=MAX_DISTANCE):
+    """
+    Groups icons that look the same, whatever their format, size or compression.
+
+    Args:
+        paths (list): Icon files. Files Pillow cannot open are left out.
+        max_distance (int): Largest Hamming distance between hashes of the same picture.
+
+    Returns:
+        list: Groups of two or more paths.
+    """
+    thumbnails, readable = [], []
+    for path in paths:
+        try:
+            thumbnails.append(load_thumbnail(path))
+            readable.append(path)
+        except Exception as e:
+            print(f"Skipping unreadable icon {path}: {e}")
+    if len(readable) < 2:
+        return []
+
+    close = hamming_distances(difference_hashes(np.stack(thumbnails))) <= max_distance
+
+    # Union-find over the pairs that are close enough
+    parent = list(range(len(readable)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(np.triu(close, k=1))):
+        parent[find(i)] = find(j)
+
+    groups = {}
+    for i, path in enumerate(readable):
+        groups.setdefault(find(i), []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def pick_icon(group, min_size=MIN_ADEQUATE_SIZE):
+    """
+    Chooses the version of an icon to keep: the smallest file that is at least `min_size`
+    pixels on its shorter side, or the sharpest one if none is that big.
+    """
+    def dimensions(path):
+        with Image.open(path) as image:
+            return min(image.size)
+
+    sizes = {path: dimensions(path) for path in group}
+    adequate = [path for path in group if sizes[path] >= min_size]
+    if adequate:
+        return min(adequate, key=os.path.getsize)
+    return max(group, key=lambda path: (sizes[path], -os.path.getsize(path)))
+
+
+def merge_similar_icons(paths, max_distance=MAX_DISTANCE, min_size=MIN_ADEQUATE_SIZE):
+    """
+    Deletes all but one version of every icon that is stored more than once.
+
+    Args:
+        paths (list): Icon files to compare.
+        max_distance (int): See group_similar.
+        min_size (int): See pick_icon.
+
+    Returns:
+        dict: path of each deleted icon -> path of the icon kept in its place.
+    """
+    replaced = {}
+    for group in group_similar(paths, max_distance):
+        keep = pick_icon(group, min_size)
+        for path in group:
+            if path != keep:
+                os.remove(path)
+                replaced[path] = keep
+        print(f"Kept {os.path.basename(keep)} out of {len(group)} versions of the same icon")
+    return replaced
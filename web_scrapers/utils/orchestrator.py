@@ -0,0 +1,139 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Threads of sources that timed out, see abandoned()
+_abandoned = set()
+_abandoned_lock = threading.Lock()
+
+
+def abandoned(thread: Optional[threading.Thread] = None) -> bool:
+    """
+    Whether the source running on `thread` (the calling thread by default) timed out.
+
+    The orchestrator cannot stop a thread, so a source that outlives its timeout keeps
+    running while the rest of the run moves on to renaming and ingesting files. Sources
+    check this before writing into database/ and skip the write once they are abandoned.
+    """
+    with _abandoned_lock:
+        return (thread or threading.current_thread()) in _abandoned
+
+
+class SourceResult:
+    """Outcome of a single scrape source run by the orchestrator."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"
+        self.started = None
+        self.finished = None
+        self.error = ""
+
+    @property
+    def duration(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+
+def run_sources(sources: Dict[str, Callable[[], None]],
+                max_workers: int = 3,
+                timeout: float = 600,
+                timeouts: Optional[Dict[str, float]] = None) -> List[SourceResult]:
+    """
+    Runs scrape sources (spiders and bots) concurrently on a bounded pool of worker threads.
+
+    Each source is a zero-argument callable that builds and runs one spider or bot, e.g.
+    `lambda: NCR_Bot().run()`. At most `max_workers` sources run at the same time. A source
+    that runs longer than its timeout is reported as "timeout" and no longer waited on; its
+    daemon thread is abandoned so the rest of the run can finish, and abandoned() tells the
+    source to skip its remaining writes. shutdown_pool() then quits the browser it holds.
+
+    Args:
+        sources (dict): Mapping of source name to the callable that runs it.
+        max_workers (int): Maximum number of sources running at once. Defaults to 3.
+        timeout (float): Default per-source timeout in seconds. Defaults to 600.
+        timeouts (dict): Optional per-source overrides of `timeout`, keyed by source name.
+
+    Returns:
+        list: One SourceResult per source, in the order the sources were given.
+    """
+    timeouts = timeouts or {}
+    slots = threading.Semaphore(max(1, max_workers))
+    lock = threading.Lock()
+    results = {name: SourceResult(name) for name in sources}
+    threads = {}
+
+    def worker(name: str, job: Callable[[], None]):
+        result = results[name]
+        status, error = "ok", ""
+        try:
+            job()
+        except Exception as e:
+            status, error = "failed", str(e)
+            logging.error(f"{name} failed: {e}")
+        with lock:
+            # A source that already timed out gave its slot back when it was abandoned
+            if result.status != "timeout":
+                result.status = status
+                result.error = error
+                result.finished = time.monotonic()
+                slots.release()
+
+    run_started = time.monotonic()
+    pending = list(sources.items())
+    while pending or threads:
+        # Start as many pending sources as there are free slots
+        while pending and slots.acquire(blocking=False):
+            name, job = pending.pop(0)
+            results[name].status = "running"
+            results[name].started = time.monotonic()
+            thread = threading.Thread(target=worker, args=(name, job), name=name, daemon=True)
+            threads[name] = thread
+            logging.info(f"Starting {name}")
+            thread.start()
+
+        for name, thread in list(threads.items()):
+            result = results[name]
+            limit = timeouts.get(name, timeout)
+            if not thread.is_alive():
+                del threads[name]
+                continue
+            with lock:
+                if result.status == "running" and result.duration > limit:
+                    result.status = "timeout"
+                    result.finished = time.monotonic()
+                    result.error = f"exceeded {limit}s"
+                    with _abandoned_lock:
+                        _abandoned.add(thread)
+                    logging.error(f"{name} timed out after {limit}s, skipping whatever it still writes")
+                    del threads[name]
+                    slots.release()
+
+        time.sleep(0.2)
+
+    ordered = [results[name] for name in sources]
+    print_summary(ordered, time.monotonic() - run_started)
+    return ordered
+
+
+def print_summary(results: List[SourceResult], wall_clock: float):
+    """
+    Prints a summary table of source outcomes and the total wall-clock time of the run.
+
+    Args:
+        results (list): SourceResult entries to report.
+        wall_clock (float): Total run time in seconds.
+
+    Returns:
+        None
+    """
+    width = max([len("source")] + [len(r.name) for r in results])
+    print(f"{'source'.ljust(width)}  {'status':<8}  {'seconds':>8}  error")
+    print(f"{'-' * width}  {'-' * 8}  {'-' * 8}  {'-' * 5}")
+    for r in results:
+        print(f"{r.name.ljust(width)}  {r.status:<8}  {r.duration:>8.1f}  {r.error}")
+    total = sum(r.duration for r in results)
+    print(f"Wall-clock {wall_clock:.1f}s for {total:.1f}s of source time")
@@ -0,0 +1,240 @@
+import os
+import re
+import time
+import json
+import argparse
+import threading
+import fitz  # PyMuPDF
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from pipeline.writer import atomic_write_json
+from utils.pdf_to_image import IMAGE_EXTENSIONS, save_pixmap
+from utils.file_hash import get_hash_index
+
+CONTENT_TYPES = {'png': 'image/png', 'jpeg': 'image/jpeg', 'webp': 'image/webp'}
+# Resolutions render accepts, outside this a page is unreadable or too big to allocate
+MIN_DPI = 36
+MAX_DPI = 300
+# Seconds between saves of the access times of cache hits while serving
+INDEX_SAVE_INTERVAL = 60
+
+
+class PageRenderer:
+    """
+    Renders single PDF pages on demand and keeps them in a size-bounded disk cache.
+
+    Images are keyed by the PDF's content hash, page and DPI, so a changed PDF never serves
+    stale pages. When the cache grows past `max_bytes` the least recently used images are
+    deleted first.
+    """
+
+    def __init__(self, cache_dir='./database/page_cache', max_bytes=200 * 1024 * 1024,
+                 image_format='webp', quality=80):
+        if image_format not in IMAGE_EXTENSIONS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self.quality = quality
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._accessed = False  # access times changed since the index was last written
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def render(self, pdf_path, page, dpi=150):
+        """
+        Returns the path of the image of one page, rendering it only if it is not cached.
+
+        Args:
+            pdf_path (str): The PDF.
+            page (int): One-based page number.
+            dpi (int): Resolution of the image. Defaults to 150.
+
+        Returns:
+            str: Path of the cached image.
+
+        Raises:
+            ValueError: If the PDF has no such page, or `dpi` is outside MIN_DPI-MAX_DPI.
+        """
+        if not MIN_DPI <= dpi <= MAX_DPI:
+            raise ValueError(f"dpi must be between {MIN_DPI} and {MAX_DPI}")
+        ext = IMAGE_EXTENSIONS[self.image_format]
+        key = f'{get_hash_index().hash(pdf_path)[:16]}-p{page}-{dpi}dpi.{ext}'
+        path = os.path.join(self.cache_dir, key)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and os.path.exists(path):
+                entry['lastAccess'] = time.time()
+                self._accessed = True
+                return path
+
+        with fitz.open(pdf_path) as pdf_document:
+            if not 1 <= page <= len(pdf_document):
+                raise ValueError(f"{pdf_path} has no page {page}")
+            zoom = dpi / 72  # 72 DPI is the default resolution in PyMuPDF
+            pix = pdf_document.load_page(page - 1).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        save_pixmap(pix, tmp_path, self.image_format, self.quality)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.entries[key] = {'bytes': os.path.getsize(path), 'lastAccess': time.time()}
+            self._evict()
+            atomic_write_json(self.entries, self.index_path)
+            self._accessed = False
+        return path
+
+    def _evict(self):
+        total = sum(entry['bytes'] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['lastAccess']):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries.pop(key)['bytes']
+            path = os.path.join(self.cache_dir, key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def save_index(self, changed_only=False):
+        """
+        Persists access times, which `render` only updates in memory on cache hits.
+
+        Args:
+            changed_only (bool): Skip the write when no cache hit happened since the last one.
+        """
+        with self._lock:
+            if changed_only and not self._accessed:
+                return
+            atomic_write_json(self.entries, self.index_path)
+            self._accessed = False
+
+    def prewarm(self, pdf_folder='./database/pdfs', pages=1, dpi=150):
+        """
+        Renders the first `pages` pages of every PDF in `pdf_folder`, the ones most users look at.
+
+        Returns:
+            int: Number of page images now in the cache for those PDFs.
+        """
+        count = 0
+        for pdf_filename in sorted(os.listdir(pdf_folder)):
+            if not pdf_filename.lower().endswith('.pdf'):
+                continue
+            pdf_path = os.path.join(pdf_folder, pdf_filename)
+            with fitz.open(pdf_path) as pdf_document:
+                page_count = len(pdf_document)
+            for page in range(1, min(pages, page_count) + 1):
+                self.render(pdf_path, page, dpi)
+                count += 1
+            print(f"Pre-warmed {min(pages, page_count)} of {page_count} pages of {pdf_filename}")
+        self.save_index()
+        get_hash_index().save()
+        return count
+
+
+def serve(renderer, pdf_folder='./database/pdfs', host='127.0.0.1', port=8001):
+    """
+    Serves page images over HTTP at /<pdf file>/<page>?dpi=<dpi>, rendering them on first request.
+
+    Access times of cache hits are saved every INDEX_SAVE_INTERVAL seconds and on shutdown, so
+    after a restart eviction still goes by when pages were last viewed, not when they were rendered.
+    """
+    content_type = CONTENT_TYPES[renderer.image_format]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            match = re.fullmatch(r'/([^/]+\.pdf)/(\d+)', url.path)
+            pdf_path = os.path.join(pdf_folder, match.group(1)) if match else None
+            if not match or not os.path.exists(pdf_path):
+                self.send_error(404)
+                return
+            try:
+                dpi = int(parse_qs(url.query).get('dpi', ['150'])[0])
+            except ValueError:
+                dpi = None
+            if dpi is None or not MIN_DPI <= dpi <= MAX_DPI:
+                self.send_error(400, f"dpi must be a number between {MIN_DPI} and {MAX_DPI}")
+                return
+            body = None
+            for _ in range(3):
+                try:
+                    path = renderer.render(pdf_path, int(match.group(2)), dpi)
+                    with open(path, 'rb') as f:
+                        body = f.read()
+                    break
+                except ValueError as e:
+                    self.send_error(404, str(e))
+                    return
+                except FileNotFoundError:
+                    # Evicted by another request between render and open, render it again
+                    continue
+            if body is None:
+                self.send_error(503, "Page cache is too busy, try again")
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'public, max-age=86400')
+            self.end_headers()
+            self.wfile.write(body)
+
+    stopped = threading.Event()
+
+    def save_access_times():
+        while not stopped.wait(INDEX_SAVE_INTERVAL):
+            renderer.save_index(changed_only=True)
+
+    threading.Thread(target=save_access_times, daemon=True).start()
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving PDF pages from {pdf_folder} on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        server.server_close()
+        renderer.save_index(changed_only=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render PDF pages on demand with an LRU disk cache.")
+    parser.add_argument('--cache-dir', default='./database/page_cache')
+    parser.add_argument('--max-mb', type=int, default=200, help="Cache size limit in MB")
+    parser.add_argument('--format', default='webp', choices=sorted(IMAGE_EXTENSIONS))
+    parser.add_argument('--quality', type=int, default=80)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    prewarm = commands.add_parser('prewarm', help="Render the first pages of every PDF")
+    prewarm.add_argument('--pdf-folder', default='./database/pdfs')
+    prewarm.add_argument('--pages', type=int, default=1, help="Pages to render per PDF")
+    prewarm.add_argument('--dpi', type=int, default=150)
+
+    render = commands.add_parser('render', help="Render one page and print its path")
+    render.add_argument('pdf')
+    render.add_argument('page', type=int)
+    render.add_argument('--dpi', type=int, default=150)
+
+    server = commands.add_parser('serve', help="Serve pages over HTTP, rendering them on first request")
+    server.add_argument('--pdf-folder', default='./database/pdfs')
+    server.add_argument('--host', default='127.0.0.1')
+    server.add_argument('--port', type=int, default=8001)
+
+    args = parser.parse_args()
+    renderer = PageRenderer(args.cache_dir, args.max_mb * 1024 * 1024, args.format, args.quality)
+    if args.command == 'prewarm':
+        renderer.prewarm(args.pdf_folder, args.pages, args.dpi)
+    elif args.command == 'render':
+        print(renderer.render(args.pdf, args.page, args.dpi))
+    else:
+        serve(renderer, args.pdf_folder, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline.writer import atomic_write_json
+from utils.file_hash import get_hash_index
+
+# Start of a post in a vacancy circular, e.g. "POST 38/12 : DEPUTY DIRECTOR" or "POSITION: Clerk"
+POST_HEADING = re.compile(r'^\s*(?:POST\s+\d+\s*/\s*\d+|POSITION|JOB TITLE|VACANCY)\b\s*[:\-]?\s*(?P<title>.*)$',
+                          re.IGNORECASE | re.MULTILINE)
+
+# Labelled fields, each value runs to the end of its line
+FIELD_PATTERNS = {
+    'reference': re.compile(r'\b(?:REF(?:ERENCE)?\.?\s*(?:NO|NUMBER)?\.?)\s*[:\-]\s*(?P<value>[^\n]+)', re.IGNORECASE),
+    'closingDate': re.compile(r'\bCLOSING\s+DATE\s*[:\-]?\s*(?P<value>[^\n]+)', re.IGNORECASE),
+    'location': re.compile(r'\b(?:CENTRE|CENTER|LOCATION|PLACE OF WORK|BASED AT)\s*[:\-]\s*(?P<value>[^\n]+)', re.IGNORECASE),
+    'salary': re.compile(r'\b(?:SALARY|REMUNERATION)\s*[:\-]\s*(?P<value>[^\n]+)', re.IGNORECASE),
+}
+
+
+def clean_text(text):
+    """Collapses runs of spaces and blank lines left by the PDF layout."""
+    lines = (re.sub(r'[ \t\u00a0]+', ' ', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_fields(text):
+    """Returns the labelled fields found in `text`, first match wins, empty string if missing."""
+    fields = {}
+    for name, pattern in FIELD_PATTERNS.items():
+        match = pattern.search(text)
+        fields[name] = match.group('value').strip() if match else ''
+    return fields
+
+
+def split_posts(text):
+    """
+    Splits the text of a circular into its posts.
+
+    Args:
+        text (str): Cleaned text of the whole PDF.
+
+    Returns:
+        list: One dict per post with title, reference, closingDate, location, salary and text.
+        A circular without recognisable post headings is returned as a single post.
+    """
+    headings = list(POST_HEADING.finditer(text))
+    if not headings:
+        headings_text = [(text.split('\n', 1)[0] if text else '', text)]
+    else:
+        headings_text = []
+        for i, heading in enumerate(headings):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            headings_text.append((heading.group('title'), text[heading.start():end]))
+
+    # Fields stated once for the whole circular, e.g. a shared closing date
+    shared = extract_fields(text)
+    posts = []
+    for title, body in headings_text:
+        body = body.strip()
+        fields = extract_fields(body)
+        # Titles often share the line with the reference number
+        title = FIELD_PATTERNS['reference'].split(title)[0].strip(' :-')
+        posts.append({
+            'title': title,
+            **{name: value or shared[name] for name, value in fields.items()},
+            'text': body,
+        })
+    return posts
+
+
+def extract_pdf(pdf_path):
+    """
+    Extracts the text of a PDF and splits it into posts. Runs in a worker process.
+
+    Returns:
+        dict: "pages" (page count), "scanned" (True when no page has a text layer) and "posts".
+    """
+    with fitz.open(pdf_path) as pdf_document:
+        page_count = len(pdf_document)
+        text = clean_text('\n'.join(page.get_text() for page in pdf_document))
+    return {
+        'pages': page_count,
+        # Scanned circulars are images only, they need OCR before they can be split
+        'scanned': not text,
+        'posts': split_posts(text) if text else [],
+    }
+
+
+def extract_text_from_pdfs(pdf_folder='./database/pdfs',
+                           json_file_path='./database/pdf_images/posts.json',
+                           max_workers=None):
+    """
+    Extracts the posts of every PDF in `pdf_folder` into one compact JSON file, spreading PDFs across CPU cores.
+
+    Each entry records the PDF's SHA-256, so PDFs that have not changed since the last run are
+    not opened again. Entries for PDFs that no longer exist are dropped.
+
+    Args:
+        pdf_folder (str): Directory containing the PDFs. Defaults to "./database/pdfs".
+        json_file_path (str): Output file, next to metadata.json by default.
+        max_workers (int): Worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
+    existing = {}
+    if os.path.exists(json_file_path):
+        with open(json_file_path) as f:
+            existing = {entry['file']: entry for entry in json.load(f)}
+
+    pdf_filenames = sorted(f for f in os.listdir(pdf_folder) if f.lower().endswith('.pdf'))
+    entries = {}
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        futures = {}
+        for pdf_filename in pdf_filenames:
+            pdf_path = os.path.join(pdf_folder, pdf_filename)
+            pdf_hash = get_hash_index().hash(pdf_path)
+            entry = existing.get(pdf_filename)
+            if entry and entry['sha256'] == pdf_hash:
+                entries[pdf_filename] = entry
+                continue
+            futures[executor.submit(extract_pdf, pdf_path)] = (pdf_filename, pdf_hash)
+
+        for future in as_completed(futures):
+            pdf_filename, pdf_hash = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error extracting text from {pdf_filename}: {e}")
+                continue
+            entries[pdf_filename] = {'file': pdf_filename, 'sha256': pdf_hash, **result}
+            state = "no text layer" if result['scanned'] else f"{len(result['posts'])} posts"
+            print(f"Extracted {pdf_filename}: {state}")
+
+    data = [entries[name] for name in pdf_filenames if name in entries]
+    # Compact separators, the frontend downloads this file as is
+    atomic_write_json(data, json_file_path, indent=None, separators=(',', ':'))
+    get_hash_index().save()
+    print(f"PDF text saved to: {json_file_path}")
@@ -1,70 +1,241 @@
 import os
 import json
+import shutil
 import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline.writer import atomic_write_json
+from utils.file_hash import get_hash_index
+
+IMAGE_EXTENSIONS = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+# Resolution of the medium variant, enough to read a circular on a phone
+MEDIUM_DPI = 110
+# Width in pixels of the thumbnail variant
+THUMB_WIDTH = 200
+
+
+def image_names(base_name, page_index, image_format):
+    """File names of the full, medium and thumbnail images of a page."""
+    ext = IMAGE_EXTENSIONS[image_format]
+    stem = f'{base_name}_page_{page_index+1}'
+    return {
+        'full': f'{stem}.{ext}',
+        'medium': f'{stem}_medium.{ext}',
+        'thumb': f'{stem}_thumb.{ext}',
+    }
+
+
+def save_pixmap(pix, path, image_format, quality):
+    """Encodes a rendered page as PNG, JPEG or WebP."""
+    if image_format == 'png':
+        pix.save(path)
+    elif image_format == 'jpeg':
+        pix.save(path, jpg_quality=quality)
+    else:
+        # PyMuPDF cannot write WebP, hand the pixels to Pillow
+        from PIL import Image
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        image.save(path, "WEBP", quality=quality, method=4)
+
+
+def render_pages(pdf_path, page_numbers, dpi, pdf_output_folder, base_name, image_format, quality):
+    """
+    Renders the full, medium and thumbnail images of some pages of a PDF. Runs in a worker process.
+
+    Args:
+        pdf_path (str): The PDF to render.
+        page_numbers (list): Zero-based indexes of the pages to render.
+        dpi (int): Resolution of the full size images.
+        pdf_output_folder (str): Directory the images are written to.
+        base_name (str): PDF file name without extension, used to name the images.
+        image_format (str): "png", "jpeg" or "webp".
+        quality (int): JPEG/WebP quality, 1-100.
+
+    Returns:
+        dict: For each rendered page index, the name, width, height and byte size of each variant.
+    """
+    rendered = {}
+    with fitz.open(pdf_path) as pdf_document:
+        for i in page_numbers:
+            page = pdf_document.load_page(i)
+            # 72 DPI is the default resolution in PyMuPDF
+            zooms = {
+                'full': dpi / 72,
+                'medium': min(dpi, MEDIUM_DPI) / 72,
+                'thumb': THUMB_WIDTH / page.rect.width,
+            }
+            variants = {}
+            for variant, name in image_names(base_name, i, image_format).items():
+                pix = page.get_pixmap(matrix=fitz.Matrix(zooms[variant], zooms[variant]), alpha=False)
+                path = os.path.join(pdf_output_folder, name)
+                save_pixmap(pix, path, image_format, quality)
+                variants[variant] = {
+                    'name': name,
+                    'width': pix.width,
+                    'height': pix.height,
+                    'bytes': os.path.getsize(path),
+                }
+            rendered[i] = variants
+    return rendered
+
 
 def create_images_from_pdf_pages(pdf_folder='./database/pdfs',
                                  output_folder='./database/pdf_images',
                                  json_file_path='./database/pdf_images/metadata.json',
-                                 dpi=300):  # Specify the desired DPI (dots per inch)
+                                 dpi=300,  # Specify the desired DPI (dots per inch)
+                                 image_format='webp',
+                                 quality=80,
+                                 max_workers=None):
+    """
+    Renders every page of every PDF in `pdf_folder`, spreading pages across CPU cores.
+
+    Each page is written as a full size image at `dpi`, a medium image at MEDIUM_DPI and a
+    THUMB_WIDTH pixel wide thumbnail, in a compact web format. A render manifest next to the
+    metadata records each PDF's SHA-256 and the settings it was rendered with; PDFs whose
+    hash and settings match and whose images are still on disk are skipped. metadata.json
+    is updated entry by entry instead of being rebuilt. The entries and image directories of
+    PDFs that no longer exist, e.g. after the PDFs were renamed by content hash, are removed.
+
+    Args:
+        pdf_folder (str): Directory containing the PDFs. Defaults to "./database/pdfs".
+        output_folder (str): Directory the page images are written to. Defaults to "./database/pdf_images".
+        json_file_path (str): Metadata file listing each PDF's images.
+        dpi (int): Resolution of the full size images. Defaults to 300.
+        image_format (str): "webp", "jpeg" or "png". Defaults to "webp".
+        quality (int): JPEG/WebP quality, 1-100. Defaults to 80.
+        max_workers (int): Worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        None
+    """
+    if image_format not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+
     # Create output directory if it doesn't exist
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
     print(f"Output directory: {output_folder}")
 
-    # Initialize metadata list
-    metadata = []
-
-    # Process each PDF file in the folder
-    for pdf_filename in os.listdir(pdf_folder):
-        if pdf_filename.lower().endswith('.pdf'):
-            print(f"Processing PDF file: {pdf_filename}")
-
+    manifest_path = os.path.join(output_folder, 'render_manifest.json')
+    manifest = load_json(manifest_path, {})
+    metadata = {entry['file']: entry for entry in load_json(json_file_path, [])}
+    settings = {'dpi': dpi, 'format': image_format, 'quality': quality,
+                'mediumDpi': MEDIUM_DPI, 'thumbWidth': THUMB_WIDTH}
+
+    pdf_filenames = sorted(f for f in os.listdir(pdf_folder) if f.lower().endswith('.pdf'))
+    workers = max_workers or os.cpu_count() or 1
+
+    # Drop PDFs that are gone
+    for stale in set(metadata) - set(pdf_filenames):
+        del metadata[stale]
+    for stale in set(manifest) - set(pdf_filenames):
+        del manifest[stale]
+    remove_orphaned_folders(output_folder, {os.path.splitext(f)[0] for f in pdf_filenames})
+
+    jobs = {}  # pdf file name -> (hash, page count, rendered pages)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for pdf_filename in pdf_filenames:
             pdf_path = os.path.join(pdf_folder, pdf_filename)
             base_name = os.path.splitext(pdf_filename)[0]
             pdf_output_folder = os.path.join(output_folder, base_name)
+            pdf_hash = get_hash_index().hash(pdf_path)
+
+            rendered = manifest.get(pdf_filename)
+            if rendered and rendered['sha256'] == pdf_hash and rendered.get('settings') == settings and \
+               pdf_filename in metadata and \
+               all_images_exist(pdf_output_folder, base_name, rendered['pages'], image_format):
+                print(f"Skipping unchanged PDF: {pdf_filename}")
+                continue
 
+            print(f"Processing PDF file: {pdf_filename}")
             # Create a directory for each PDF
             if not os.path.exists(pdf_output_folder):
                 os.makedirs(pdf_output_folder)
 
-            print(f"Created directory for PDF images: {pdf_output_folder}")
-
-            # Open the PDF file
-            pdf_document = fitz.open(pdf_path)
-            print(f"Opened PDF document: {pdf_path}")
+            with fitz.open(pdf_path) as pdf_document:
+                page_count = len(pdf_document)
+
+            # Split the pages into one chunk per worker so each process opens the PDF once
+            chunk = max(1, -(-page_count // workers))
+            jobs[pdf_filename] = (pdf_hash, page_count, {})
+            for start in range(0, page_count, chunk):
+                pages = list(range(start, min(start + chunk, page_count)))
+                future = executor.submit(render_pages, pdf_path, pages, dpi, pdf_output_folder,
+                                         base_name, image_format, quality)
+                futures[future] = pdf_filename
+
+        for future in as_completed(futures):
+            pdf_filename = futures[future]
+            pdf_hash, page_count, pages = jobs[pdf_filename]
+            try:
+                pages.update(future.result())
+            except Exception as e:
+                print(f"Error rendering {pdf_filename}: {e}")
+                continue
+            if len(pages) < page_count:
+                continue
+
+            # Every page of this PDF is done, record it
+            base_name = os.path.splitext(pdf_filename)[0]
+            url = f'./assets/pdf_images/{base_name}'
+            page_entries = []
+            for i in range(page_count):
+                page_entries.append({
+                    variant: {
+                        'src': f"{url}/{info['name']}",
+                        'width': info['width'],
+                        'height': info['height'],
+                        'bytes': info['bytes'],
+                    } for variant, info in pages[i].items()
+                })
+            metadata[pdf_filename] = {
+                'file': pdf_filename,
+                'images': [p['full']['src'] for p in page_entries],
+                'pages': page_entries,
+            }
+            manifest[pdf_filename] = {'sha256': pdf_hash, 'settings': settings, 'pages': page_count}
+            remove_stale_images(os.path.join(output_folder, base_name),
+                                {info['name'] for p in pages.values() for info in p.values()})
+            atomic_write_json(list(metadata.values()), json_file_path)
+            atomic_write_json(manifest, manifest_path)
+            total = sum(p['bytes'] for entry in page_entries for p in entry.values())
+            print(f"Rendered {page_count} pages of {pdf_filename} ({total // 1024} KB)")
+
+    # Save metadata to JSON, also covers PDFs that were removed
+    atomic_write_json(list(metadata.values()), json_file_path)
+    atomic_write_json(manifest, manifest_path)
+    get_hash_index().save()
 
-            # List to store image paths
-            image_paths = []
+    print(f"Metadata saved to: {json_file_path}")
+    print("Processing completed.")
 
-            for i in range(len(pdf_document)):
-                print(f"Rendering page {i + 1} of {len(pdf_document)}")
 
-                # Get a page
-                page = pdf_document.load_page(i)
+def load_json(path, default):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return default
 
-                # Calculate the scaling factor based on the DPI
-                zoom = dpi / 72  # 72 DPI is the default resolution in PyMuPDF
-                matrix = fitz.Matrix(zoom, zoom)  # Create transformation matrix for zooming
 
-                # Render page to an image with the desired DPI
-                pix = page.get_pixmap(matrix=matrix)  # Apply the matrix to the page rendering
-                image_path = os.path.join(pdf_output_folder, f'{base_name}_page_{i+1}.png')
-                pix.save(image_path)
-                image_paths.append(f'./assets/pdf_images/{base_name}/{base_name}_page_{i+1}.png')
+def all_images_exist(pdf_output_folder, base_name, page_count, image_format):
+    return all(os.path.exists(os.path.join(pdf_output_folder, name))
+               for i in range(page_count)
+               for name in image_names(base_name, i, image_format).values())
 
-                print(f"Saved image: {image_path}")
 
-            # Add metadata entry
-            metadata.append({
-                'file': pdf_filename,
-                'images': image_paths
-            })
+def remove_stale_images(pdf_output_folder, keep):
+    """Deletes images left over from an older render, e.g. extra pages or another format."""
+    for name in os.listdir(pdf_output_folder):
+        if name not in keep:
+            os.remove(os.path.join(pdf_output_folder, name))
 
-    # Save metadata to JSON, replacing it if it already exists
-    with open(json_file_path, 'w') as json_file:
-        json.dump(metadata, json_file, indent=4)
-    
-    print(f"Metadata saved to: {json_file_path}")
-    print("Processing completed.")
 
+def remove_orphaned_folders(output_folder, base_names):
+    """Deletes the image directories of PDFs that are gone, every directory not in `base_names`."""
+    for name in os.listdir(output_folder):
+        path = os.path.join(output_folder, name)
+        if os.path.isdir(path) and name not in base_names:
+            shutil.rmtree(path)
+            print(f"Removed images of deleted PDF: {name}")
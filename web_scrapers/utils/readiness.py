@@ -0,0 +1,122 @@
+import os
+import time
+import logging
+from typing import Optional, Set
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Suffixes of files Firefox is still writing to
+PARTIAL_DOWNLOAD_SUFFIXES = ('.part', '.crdownload', '.tmp')
+
+
+def _report(what: str, started: float) -> float:
+    elapsed = time.monotonic() - started
+    logging.info(f"Waited {elapsed:.2f}s for {what}")
+    return elapsed
+
+
+def wait_for_document_ready(driver, timeout: float = 10) -> float:
+    """
+    Waits until the current page's `document.readyState` is "complete".
+
+    Args:
+        driver: The webdriver to poll.
+        timeout (float): Maximum seconds to wait. Defaults to 10.
+
+    Returns:
+        float: Seconds spent waiting. A page still loading after `timeout` is logged, not raised.
+    """
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") == "complete")
+    except Exception:
+        logging.warning(f"Page not ready after {timeout}s, continuing")
+    return _report("document ready", started)
+
+
+def wait_for_selector(driver, selector: str, by: str = By.CSS_SELECTOR,
+                      timeout: float = 10, visible: bool = False):
+    """
+    Waits until an element matching `selector` is present (or visible) in the page.
+
+    Args:
+        driver: The webdriver to poll.
+        selector (str): The CSS selector or XPath to wait for.
+        by (str): How to interpret `selector`. Defaults to By.CSS_SELECTOR.
+        timeout (float): Maximum seconds to wait. Defaults to 10.
+        visible (bool): Wait for the element to be visible, not just present. Defaults to False.
+
+    Returns:
+        WebElement: The first matching element.
+
+    Raises:
+        TimeoutException: If no element matches within `timeout`.
+    """
+    started = time.monotonic()
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    element = WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition((by, selector)))
+    _report(f"'{selector}'", started)
+    return element
+
+
+def wait_for_network_idle(driver, idle: float = 0.5, timeout: float = 10) -> float:
+    """
+    Waits until the page is loaded and has requested no new resources for `idle` seconds.
+
+    Args:
+        driver: The webdriver to poll.
+        idle (float): Seconds without new resource requests that count as idle. Defaults to 0.5.
+        timeout (float): Maximum seconds to wait. Defaults to 10.
+
+    Returns:
+        float: Seconds spent waiting. A page still busy after `timeout` is logged, not raised.
+    """
+    started = time.monotonic()
+    script = "return [document.readyState, performance.getEntriesByType('resource').length]"
+    last_count, quiet_since = None, time.monotonic()
+    while time.monotonic() - started < timeout:
+        try:
+            state, count = driver.execute_script(script)
+        except Exception:
+            # The document is being replaced, try again on the next one
+            state, count = None, None
+        if count != last_count or state != "complete":
+            last_count, quiet_since = count, time.monotonic()
+        elif time.monotonic() - quiet_since >= idle:
+            return _report("network idle", started)
+        time.sleep(0.1)
+    logging.warning(f"Network not idle after {timeout}s, continuing")
+    return _report("network idle", started)
+
+
+def wait_for_download(directory: str, before: Set[str], timeout: float = 60) -> Set[str]:
+    """
+    Waits until a new, fully written file appears in `directory`.
+
+    Args:
+        directory (str): The browser's download directory.
+        before (set): File names in `directory` before the download was started.
+        timeout (float): Maximum seconds to wait. Defaults to 60.
+
+    Returns:
+        set: Names of the new files, empty if nothing finished downloading within `timeout`.
+    """
+    started = time.monotonic()
+    sizes: Optional[dict] = None
+    while time.monotonic() - started < timeout:
+        names = set(os.listdir(directory)) - before
+        partial = {n for n in names if n.endswith(PARTIAL_DOWNLOAD_SUFFIXES)}
+        done = names - partial
+        if done and not partial:
+            # Firefox can rename the .part file before its last write lands; wait for a stable size
+            current = {n: os.path.getsize(os.path.join(directory, n)) for n in done}
+            if current == sizes:
+                _report(f"download of {', '.join(sorted(done))}", started)
+                return done
+            sizes = current
+        time.sleep(0.2)
+    logging.warning(f"No download finished in {directory} after {timeout}s")
+    _report("download", started)
+    return set()
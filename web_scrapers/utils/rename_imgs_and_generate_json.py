@@ -1,63 +1,37 @@
 import os
 import json
-import uuid
-import hashlib
 
-def get_file_hash(filepath):
-    """Compute the MD5 hash of a file."""
-    hash_md5 = hashlib.md5()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+from pipeline.writer import atomic_write_json
+from utils.asset_store import AssetStore
+from utils.download_cache import get_download_cache
 
-def rename_images_and_create_json(directory="./database/agency_icons"):
+def rename_images_and_create_json(directory="./database/agency_icons", merge_similar=False):
     """
-    Renames image files in the specified directory to a numerical sequence, deletes duplicates, and creates a JSON file containing the image URLs.
+    Stores image files in the specified directory under content-addressed names, deletes duplicates, and creates a JSON file containing the image URLs.
+
+    A file keeps the same name, and so the same URL, for as long as its content does not change.
 
     Args:
         directory (str): The directory where the images are located. Defaults to "./database/agency_icons".
+        merge_similar (bool): Also keep only one version of icons that look the same but differ
+            in format or size, e.g. a site's favicon.ico next to its PNG logo. Defaults to False.
 
     Returns:
         None
     """
-    # List all image files in the directory
-    image_files = [f for f in os.listdir(directory) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-
-    # Sort the files to ensure consistent renaming
-    image_files.sort()
-
-    # Dictionary to store file hashes and detect duplicates
-    seen_hashes = {}
-    duplicates = 0
-
-    # Step 1: Temporarily rename all files to avoid conflicts and check for duplicates
-    temp_names = {}
-    for filename in image_files:
-        old_path = os.path.join(directory, filename)
-        file_hash = get_file_hash(old_path)
-
-        if file_hash in seen_hashes:
-            # If duplicate, delete the file
-            os.remove(old_path)
-            duplicates += 1
-        else:
-            seen_hashes[file_hash] = filename
-            temp_name = f"{uuid.uuid4()}{os.path.splitext(filename)[1]}"  # Generate a unique temporary name
-            temp_path = os.path.join(directory, temp_name)
-            os.rename(old_path, temp_path)
-            temp_names[temp_name] = filename  # Keep track of original filenames
-
-    # Step 2: Rename to sequential names
-    image_urls = []
-    for count, temp_name in enumerate(temp_names, start=1):
-        file_extension = os.path.splitext(temp_name)[1]
-        new_name = f"{count}{file_extension}"
-        temp_path = os.path.join(directory, temp_name)
-        new_path = os.path.join(directory, new_name)
-        
-        os.rename(temp_path, new_path)
-        image_urls.append(f"/assets/agency_icons/{new_name}")
+    store = AssetStore(directory, "/assets/agency_icons", ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico'))
+    added, duplicates = store.ingest()
+    if merge_similar:
+        from utils.icon_dedup import merge_similar_icons
+
+        replaced = merge_similar_icons([os.path.join(directory, name) for name in store.files])
+        duplicates += len(replaced)
+        # Conditional GETs for a deleted icon are now answered by the one kept in its place
+        for removed, kept in replaced.items():
+            get_download_cache().relocate(removed, kept)
+        # Drop the deleted icons from the store's index
+        store.ingest()
+    image_urls = store.urls()
 
     # Load the JSON files
     public_sector_path = './database/public/govpage-public-sector.json'
@@ -84,7 +58,6 @@ def rename_images_and_create_json(directory="./database/agency_icons"):
     json_data = {"imageUrls": image_urls}
     json_path = os.path.join(directory, "imageUrls.json")
 
-    with open(json_path, 'w') as json_file:
-        json.dump(json_data, json_file, indent=4)
+    atomic_write_json(json_data, json_path)
 
-    print(f"Renamed {len(temp_names)} image files, deleted {duplicates} duplicates, and created/replaced imageUrls.json")
+    print(f"Stored {added} new image files, deleted {duplicates} duplicates, and created/replaced imageUrls.json")
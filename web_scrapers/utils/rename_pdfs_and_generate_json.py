@@ -1,35 +1,18 @@
 import os
-import json
-import uuid
-import hashlib
 
-def hash_file(filepath, chunk_size=8192):
-    """
-    Generates a hash for a file using SHA-256 to uniquely identify the file contents.
-
-    Args:
-        filepath (str): The path to the file to be hashed.
-        chunk_size (int): The size of each chunk read from the file. Defaults to 8192.
-
-    Returns:
-        str: The hexadecimal hash of the file.
-    """
-    hasher = hashlib.sha256()
-    with open(filepath, 'rb') as f:
-        while chunk := f.read(chunk_size):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+from pipeline.writer import atomic_write_json
+from utils.asset_store import AssetStore
 
 def rename_pdfs_and_create_json(directory="./database/pdfs"):
     """
-    Renames PDF files in the specified directory to a numerical sequence, removes duplicates, and creates a JSON file containing the PDF URLs.
+    Stores PDF files in the specified directory under content-addressed names, removes duplicates, and creates a JSON file containing the PDF URLs.
 
     This function will:
-    1. List all PDF files in the specified directory.
-    2. Remove duplicate PDF files by comparing their hashes.
-    3. Sort the remaining files alphabetically to ensure consistent renaming.
-    4. Rename each PDF file to a sequential numeric name (e.g., '1.pdf', '2.pdf') after temporarily renaming them.
-    5. Generate a list of the new PDF paths and save them in a JSON file.
+    1. Move each new PDF to a name derived from its SHA-256 (e.g., '3f9a0c2d41b7e8aa.pdf').
+    2. Remove PDFs whose content is already stored.
+    3. Save the URLs of the stored PDFs, oldest first, in a JSON file.
+
+    Unchanged PDFs keep their names, so their URLs and rendered page images stay valid between runs.
 
     Args:
         directory (str): The directory where the PDF files are located. Defaults to "./database/pdfs".
@@ -38,57 +21,17 @@ def rename_pdfs_and_create_json(directory="./database/pdfs"):
         None
 
     Outputs:
-        A JSON file named 'pdfUrls.json' will be created in the specified directory, containing the new URLs of the renamed PDF files.
+        A JSON file named 'pdfUrls.json' will be created in the specified directory, containing the URLs of the stored PDF files.
     
     Prints:
-        The function prints the number of PDF files that were renamed, duplicates deleted, and confirms the creation of the 'pdfUrls.json' file.
+        The function prints the number of new PDF files, duplicates deleted, and confirms the creation of the 'pdfUrls.json' file.
     """
-    # List all PDF files in the directory
-    pdf_files = [f for f in os.listdir(directory) if f.endswith('.pdf')]
-
-    # Step 1: Remove duplicate files by comparing their hashes
-    hash_map = {}
-    duplicates = 0
-    for filename in pdf_files:
-        file_path = os.path.join(directory, filename)
-        file_hash = hash_file(file_path)
-
-        if file_hash in hash_map:
-            os.remove(file_path)  # Remove the duplicate file
-            duplicates += 1
-        else:
-            hash_map[file_hash] = filename
-
-    # List the remaining files after removing duplicates
-    pdf_files = list(hash_map.values())
-    pdf_files.sort()  # Sort the files alphabetically to ensure consistent renaming
-
-    # Step 2: Temporarily rename all files to avoid conflicts
-    temp_names = {}
-    for filename in pdf_files:
-        temp_name = f"{uuid.uuid4()}.pdf"  # Generate a unique temporary name
-        old_path = os.path.join(directory, filename)
-        temp_path = os.path.join(directory, temp_name)
-        os.rename(old_path, temp_path)
-        temp_names[temp_name] = filename  # Keep track of original filenames
-
-    # Step 3: Rename to sequential names
-    pdf_urls = []
-    for count, temp_name in enumerate(temp_names, start=1):
-        new_name = f"{count}.pdf"
-        temp_path = os.path.join(directory, temp_name)
-        new_path = os.path.join(directory, new_name)
-        
-        os.rename(temp_path, new_path)
-        pdf_urls.append(f"/assets/pdfs/{new_name}")
+    store = AssetStore(directory, "/assets/pdfs", ('.pdf',))
+    added, duplicates = store.ingest()
 
     # Create or replace the JSON file
-    json_data = {"pdfUrls": pdf_urls}
+    json_data = {"pdfUrls": store.urls()}
     json_path = os.path.join(directory, "pdfUrls.json")
+    atomic_write_json(json_data, json_path)
 
-    # Writing the new JSON data, replacing the file if it already exists
-    with open(json_path, 'w') as json_file:
-        json.dump(json_data, json_file, indent=4)
-
-    print(f"Renamed {len(pdf_files)} PDF files, deleted {duplicates} duplicates, and created/replaced pdfUrls.json")
-
+    print(f"Stored {added} new PDF files, deleted {duplicates} duplicates, and created/replaced pdfUrls.json")